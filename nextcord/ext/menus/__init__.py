@@ -1,9 +1,121 @@
-from .constants import *
-from .exceptions import *
-from .menu_pages import *
-from .menus import *
-from .page_source import *
-from .utils import *
+import importlib
+from typing import TYPE_CHECKING, Any, Dict, List
+
+if TYPE_CHECKING:
+    from .admission import *
+    from .constants import *
+    from .exceptions import *
+    from .instrumentation import *
+    from .manager import *
+    from .menu_pages import *
+    from .menus import *
+    from .metrics import *
+    from .page_source import *
+    from .persistence import *
+    from .rendering import *
+    from .scheduler import *
+    from .sqlite import *
+    from .tracing import *
+    from .utils import *
 
 # Needed for the setup.py script
 __version__ = "1.5.7"
+
+# The public names of the submodules, which are only imported once one of
+# their names is used, so that unused parts of the extension (and their
+# dependencies such as nextcord.ext.commands) do not slow down startup.
+_LAZY_ATTRIBUTES: Dict[str, str] = {
+    "AdmissionController": "admission",
+    "log": "constants",
+    "DEFAULT_TIMEOUT": "constants",
+    "SendKwargsType": "constants",
+    "PageFormatType": "constants",
+    "EmojiType": "constants",
+    "MESSAGE_CONTENT_LIMIT": "constants",
+    "EMBED_DESCRIPTION_LIMIT": "constants",
+    "MenuError": "exceptions",
+    "CannotEmbedLinks": "exceptions",
+    "CannotSendMessages": "exceptions",
+    "CannotAddReactions": "exceptions",
+    "CannotReadMessageHistory": "exceptions",
+    "MenuObserver": "instrumentation",
+    "add_observer": "instrumentation",
+    "remove_observer": "instrumentation",
+    "MenuManager": "manager",
+    "FormatPageTimings": "menu_pages",
+    "MenuPagesBase": "menu_pages",
+    "PERSISTENT_CUSTOM_IDS": "menu_pages",
+    "PERSISTENT_SELECT_CUSTOM_ID": "menu_pages",
+    "MenuPages": "menu_pages",
+    "MenuPaginationButton": "menu_pages",
+    "MenuJumpModal": "menu_pages",
+    "MenuPageSelect": "menu_pages",
+    "MenuSearchModal": "menu_pages",
+    "ButtonMenuPages": "menu_pages",
+    "Button": "menus",
+    "button": "menus",
+    "Menu": "menus",
+    "ButtonMenu": "menus",
+    "DEFAULT_LATENCY_BUCKETS": "metrics",
+    "DEFAULT_HTTP_CALLS_BUCKETS": "metrics",
+    "MenuMetrics": "metrics",
+    "DataType": "page_source",
+    "PageSource": "page_source",
+    "cpu_bound": "page_source",
+    "ListPageSource": "page_source",
+    "KeyType": "page_source",
+    "KeyFuncType": "page_source",
+    "GroupByEntry": "page_source",
+    "GroupByPageSource": "page_source",
+    "SortablePageSource": "page_source",
+    "AsyncIteratorPageSource": "page_source",
+    "CursorType": "page_source",
+    "KeysetFetchType": "page_source",
+    "KeysetPageSource": "page_source",
+    "OffsetFetchType": "page_source",
+    "OffsetPageSource": "page_source",
+    "LineIndex": "page_source",
+    "FilePageSource": "page_source",
+    "TextPageSource": "page_source",
+    "PackedPageSource": "page_source",
+    "FilterablePageSource": "page_source",
+    "SourceFactoryType": "persistence",
+    "MenuRecord": "persistence",
+    "MenuStateStore": "persistence",
+    "SQLiteMenuStateStore": "persistence",
+    "MenuPersistence": "persistence",
+    "RenderKeyType": "rendering",
+    "ImagePageRenderer": "rendering",
+    "MessageType": "scheduler",
+    "EditScheduler": "scheduler",
+    "ParametersType": "sqlite",
+    "SQLiteConnectionPool": "sqlite",
+    "SQLitePageSource": "sqlite",
+    "EVENT_KINDS": "tracing",
+    "MenuEvent": "tracing",
+    "MenuTrace": "tracing",
+    "Position": "utils",
+    "First": "utils",
+    "Last": "utils",
+}
+_SUBMODULES = frozenset(_LAZY_ATTRIBUTES.values())
+
+if not TYPE_CHECKING:
+    # star imports of the package import every submodule
+    __all__ = tuple(_LAZY_ATTRIBUTES)
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is not None:
+        value = getattr(importlib.import_module(f".{module_name}", __name__), name)
+        # cache the value so that this is only called once per name
+        globals()[name] = value
+        return value
+    if name in _SUBMODULES:
+        return importlib.import_module(f".{name}", __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> List[str]:
+    return sorted({*globals(), *_LAZY_ATTRIBUTES, *_SUBMODULES})
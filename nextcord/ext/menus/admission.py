@@ -0,0 +1,178 @@
+import asyncio
+from typing import TYPE_CHECKING, Optional
+
+import nextcord
+
+from .constants import log
+from .menu_pages import ButtonMenuPages, MenuPagesBase
+
+if TYPE_CHECKING:
+    from .menus import Menu
+
+# weight of the newest sample in the moving average of the loop lag
+_LAG_SMOOTHING = 0.3
+
+
+class AdmissionController:
+    """Sheds load when the event loop falls behind, to keep running menus responsive.
+
+    This is passed as the ``admission`` of a :class:`MenuManager`, and every
+    menu of the manager goes through it when it starts, before its source is
+    prepared. While it is in use, the controller measures how late the event
+    loop wakes it up, and it counts the pages of the manager's menus that are
+    being formatted.
+
+    - When the loop lag reaches ``degrade_lag``, new menus are started with a
+      timeout of at most ``degraded_timeout`` and without prefetching pages.
+      Menus using a :class:`MenuPersistence` keep having no timeout.
+    - When the loop lag reaches ``reject_lag``, or ``max_renders`` pages are
+      being formatted, new menus are not started, and :meth:`send_fallback`
+      is called instead.
+
+    Example
+    ---------
+
+    .. code-block:: python3
+
+        manager = MenuManager(admission=AdmissionController(reject_lag=0.3, max_renders=50))
+
+    Parameters
+    ------------
+    degrade_lag: :class:`float`
+        The loop lag, in seconds, from which new menus are degraded. Defaults to ``0.1``.
+    reject_lag: :class:`float`
+        The loop lag, in seconds, from which new menus are rejected. Defaults to ``0.5``.
+    max_renders: Optional[:class:`int`]
+        The number of pages being formatted from which new menus are rejected.
+        Defaults to ``None``, which does not limit them.
+    degraded_timeout: :class:`float`
+        The maximum timeout of degraded menus. Defaults to ``30.0``.
+    fallback: Optional[:class:`str`]
+        The message sent instead of a rejected menu. Defaults to a short notice,
+        ``None`` sends nothing.
+    sample_interval: :class:`float`
+        The number of seconds between two measurements of the loop lag.
+        Defaults to ``0.25``.
+
+    Attributes
+    ------------
+    lag: :class:`float`
+        The moving average of the loop lag, in seconds.
+    renders: :class:`int`
+        The number of pages being formatted.
+    admitted: :class:`int`
+        The number of menus started normally.
+    degraded: :class:`int`
+        The number of menus started degraded.
+    rejected: :class:`int`
+        The number of menus rejected.
+    """
+
+    def __init__(
+        self,
+        *,
+        degrade_lag: float = 0.1,
+        reject_lag: float = 0.5,
+        max_renders: Optional[int] = None,
+        degraded_timeout: float = 30.0,
+        fallback: Optional[str] = "The bot is busy right now, please try again in a moment.",
+        sample_interval: float = 0.25,
+    ):
+        if degrade_lag > reject_lag:
+            raise ValueError("degrade_lag cannot be greater than reject_lag.")
+        self.degrade_lag = degrade_lag
+        self.reject_lag = reject_lag
+        self.max_renders = max_renders
+        self.degraded_timeout = degraded_timeout
+        self.fallback = fallback
+        self.sample_interval = sample_interval
+        self.lag = 0.0
+        self.renders = 0
+        self.admitted = 0
+        self.degraded = 0
+        self.rejected = 0
+        self._sampler: Optional[asyncio.Task] = None
+
+    async def _sample_lag(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.sample_interval
+            await asyncio.sleep(self.sample_interval)
+            lag = max(loop.time() - expected, 0.0)
+            self.lag += (lag - self.lag) * _LAG_SMOOTHING
+
+    def is_degraded(self) -> bool:
+        """:class:`bool`: Whether new menus are currently degraded or rejected."""
+        return self.lag >= self.degrade_lag or self.is_overloaded()
+
+    def is_overloaded(self) -> bool:
+        """:class:`bool`: Whether new menus are currently rejected."""
+        return self.lag >= self.reject_lag or (
+            self.max_renders is not None and self.renders >= self.max_renders
+        )
+
+    async def _admit(
+        self,
+        menu: "Menu",
+        interaction: Optional[nextcord.Interaction],
+        channel: nextcord.abc.Messageable,
+    ) -> bool:
+        if self._sampler is None or self._sampler.done():
+            self._sampler = asyncio.ensure_future(self._sample_lag())
+
+        if self.is_overloaded():
+            self.rejected += 1
+            log.debug("Rejecting menu %r, loop lag is %.3fs.", menu, self.lag)
+            try:
+                await self.send_fallback(menu, interaction, channel)
+            except Exception:
+                log.exception("Failed to send the fallback of rejected menu %r.", menu)
+            return False
+
+        if self.is_degraded():
+            self.degraded += 1
+            # persisted menus need to keep having no timeout
+            if not isinstance(menu, ButtonMenuPages) or menu._persistence is None:
+                if menu.timeout is None:
+                    menu.timeout = self.degraded_timeout
+                else:
+                    menu.timeout = min(menu.timeout, self.degraded_timeout)
+            if isinstance(menu, MenuPagesBase):
+                menu._prefetch = False
+        else:
+            self.admitted += 1
+        return True
+
+    async def send_fallback(
+        self,
+        menu: "Menu",
+        interaction: Optional[nextcord.Interaction],
+        channel: nextcord.abc.Messageable,
+    ):
+        """|coro|
+
+        Sends the :attr:`fallback` message in place of a rejected menu.
+
+        This may be overridden to respond differently.
+
+        Parameters
+        ------------
+        menu: :class:`Menu`
+            The rejected menu.
+        interaction: Optional[:class:`nextcord.Interaction`]
+            The interaction the menu was started with, if any.
+        channel: :class:`nextcord.abc.Messageable`
+            The channel the menu would have been sent to.
+        """
+        if self.fallback is None:
+            return
+        if interaction is not None and channel == interaction.channel:
+            await interaction.send(self.fallback, ephemeral=True)
+        else:
+            await channel.send(self.fallback)
+
+    def close(self):
+        """Stops measuring the loop lag until the next menu starts."""
+        if self._sampler is not None:
+            self._sampler.cancel()
+            self._sampler = None
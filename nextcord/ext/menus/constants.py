@@ -18,3 +18,9 @@ PageFormatType = Union[str, nextcord.Embed, List[nextcord.Embed], SendKwargsType
 
 # type definition for emoji parameters
 EmojiType = Union[str, nextcord.Emoji, nextcord.PartialEmoji]
+
+# maximum number of characters in the content of a message
+MESSAGE_CONTENT_LIMIT = 2000
+
+# maximum number of characters in the description of an embed
+EMBED_DESCRIPTION_LIMIT = 4096
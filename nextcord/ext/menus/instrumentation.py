@@ -0,0 +1,146 @@
+import time
+from typing import TYPE_CHECKING, List, Optional, Type
+
+from .constants import log
+
+if TYPE_CHECKING:
+    from .menus import Menu
+
+
+class MenuObserver:
+    """An interface for receiving the timings of the phases of every menu.
+
+    Observers are installed with :func:`add_observer`. While none is installed,
+    the menus do not measure anything.
+
+    Subclasses must implement :meth:`on_phase`, and can implement
+    :meth:`on_start` and :meth:`on_finish` to follow the sessions of menus.
+    """
+
+    def on_start(self, menu: "Menu"):
+        """Called when a menu has started and is waiting for button presses.
+
+        Parameters
+        ------------
+        menu: :class:`Menu`
+            The menu.
+        """
+        pass
+
+    def on_finish(self, menu: "Menu", timed_out: bool):
+        """Called when a menu has stopped, before it is finalized.
+
+        Parameters
+        ------------
+        menu: :class:`Menu`
+            The menu.
+        timed_out: :class:`bool`
+            Whether the menu stopped because it timed out.
+        """
+        pass
+
+    def on_phase(
+        self,
+        menu_cls: Type["Menu"],
+        phase: str,
+        duration: float,
+        page: Optional[int],
+        cache_hit: Optional[bool],
+    ):
+        """Called after a phase of a menu has completed.
+
+        The phases are:
+
+        - ``start``: the whole of :meth:`Menu.start`.
+        - ``press``: handling a press of a button, from receiving it to the end of its action.
+        - ``prepare``: preparing the source in :meth:`MenuPagesBase.start`.
+        - ``lock_wait``: waiting for the locks of a reaction button in :meth:`Menu.update`.
+        - ``button``: running the action of a reaction button in :meth:`Menu.update`.
+        - ``get_page``: :meth:`PageSource.get_page`.
+        - ``format_page``: :meth:`PageSource.format_page`.
+        - ``normalize``: turning the formatted page into message keyword arguments.
+        - ``send``: sending the initial message of a menu with pages.
+        - ``edit``: editing the message to show a page.
+
+        This is called from the event loop and should return quickly.
+        The timing is passed as arguments so that recording it does not
+        create any object.
+
+        Subclasses must implement this.
+
+        Parameters
+        ------------
+        menu_cls: Type[:class:`Menu`]
+            The class of the menu.
+        phase: :class:`str`
+            The name of the phase.
+        duration: :class:`float`
+            The duration of the phase in seconds, measured with :func:`time.perf_counter`.
+        page: Optional[:class:`int`]
+            The page number the phase is about, if any.
+        cache_hit: Optional[:class:`bool`]
+            For ``get_page``, whether the page was cached by the source. ``None`` if
+            the source does not cache pages or the phase is not ``get_page``.
+        """
+        raise NotImplementedError
+
+
+# the installed observers, the menus only check whether the list is empty
+_observers: List[MenuObserver] = []
+
+
+def add_observer(observer: MenuObserver):
+    """Installs an observer receiving the timings of the phases of every menu.
+
+    Parameters
+    ------------
+    observer: :class:`MenuObserver`
+        The observer to install.
+    """
+    if observer not in _observers:
+        _observers.append(observer)
+
+
+def remove_observer(observer: MenuObserver):
+    """Uninstalls an observer installed with :func:`add_observer`, if it is installed.
+
+    Parameters
+    ------------
+    observer: :class:`MenuObserver`
+        The observer to uninstall.
+    """
+    try:
+        _observers.remove(observer)
+    except ValueError:
+        pass
+
+
+def _notify_start(menu: "Menu"):
+    for observer in _observers:
+        try:
+            observer.on_start(menu)
+        except Exception:
+            log.exception("Observer %r failed to handle the start of %r.", observer, menu)
+
+
+def _notify_finish(menu: "Menu", timed_out: bool):
+    for observer in _observers:
+        try:
+            observer.on_finish(menu, timed_out)
+        except Exception:
+            log.exception("Observer %r failed to handle the end of %r.", observer, menu)
+
+
+def _notify(
+    menu: "Menu",
+    phase: str,
+    started: float,
+    page: Optional[int] = None,
+    cache_hit: Optional[bool] = None,
+):
+    duration = time.perf_counter() - started
+    for observer in _observers:
+        try:
+            observer.on_phase(menu.__class__, phase, duration, page, cache_hit)
+        except Exception:
+            log.exception("Observer %r failed to handle the %s phase of %r.", observer, phase, menu)
@@ -0,0 +1,352 @@
+import asyncio
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Dict, List, NamedTuple, Optional, OrderedDict as OrderedDictT, Set
+
+import nextcord
+
+from .constants import log
+
+if TYPE_CHECKING:
+    from .admission import AdmissionController
+    from .menus import Menu
+    from .scheduler import EditScheduler
+
+
+class _MenuScope(NamedTuple):
+    guild_id: Optional[int]
+    channel_id: Optional[int]
+    user_id: Optional[int]
+
+
+class MenuManager:
+    """A registry of running menus, limiting how many can run at once.
+
+    Menus created with this as their ``manager`` are registered when they
+    start and unregistered when they stop. When starting a menu would exceed
+    one of the limits, the least recently used menu in the same scope is
+    stopped, and thus finalized, to make room for it. A menu is used whenever
+    one of its buttons is pressed.
+
+    Example
+    ---------
+
+    .. code-block:: python3
+
+        manager = MenuManager(max_menus=1000, max_per_user=3)
+
+        @bot.slash_command()
+        async def pages(interaction):
+            await ButtonMenuPages(MySource(data), manager=manager).start(interaction=interaction)
+
+    Parameters
+    ------------
+    max_menus: Optional[:class:`int`]
+        The maximum number of running menus. Defaults to ``None``, which is unlimited.
+    max_per_guild: Optional[:class:`int`]
+        The maximum number of running menus in a guild. Defaults to ``None``.
+    max_per_channel: Optional[:class:`int`]
+        The maximum number of running menus in a channel. Defaults to ``None``.
+    max_per_user: Optional[:class:`int`]
+        The maximum number of running menus started by a user. Defaults to ``None``.
+    admission: Optional[:class:`AdmissionController`]
+        The controller deciding whether new menus can start while the bot is
+        under load. Defaults to ``None``, which always starts them.
+    edit_scheduler: Optional[:class:`EditScheduler`]
+        The scheduler queuing the message edits of the menus per channel.
+        Defaults to ``None``, which edits the messages directly.
+
+    Attributes
+    ------------
+    started: :class:`int`
+        The number of menus registered so far.
+    evicted: :class:`int`
+        The number of menus stopped to respect the limits.
+    finished: :class:`int`
+        The number of menus that stopped on their own, e.g. by timing out.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_menus: Optional[int] = None,
+        max_per_guild: Optional[int] = None,
+        max_per_channel: Optional[int] = None,
+        max_per_user: Optional[int] = None,
+        admission: Optional["AdmissionController"] = None,
+        edit_scheduler: Optional["EditScheduler"] = None,
+    ):
+        for limit in (max_menus, max_per_guild, max_per_channel, max_per_user):
+            if limit is not None and limit < 1:
+                raise ValueError("Menu limits must be at least 1.")
+        self.max_menus = max_menus
+        self.max_per_guild = max_per_guild
+        self.max_per_channel = max_per_channel
+        self.max_per_user = max_per_user
+        self.admission = admission
+        self.edit_scheduler = edit_scheduler
+        self.started = 0
+        self.evicted = 0
+        self.finished = 0
+        # every mapping is ordered from the least to the most recently used menu
+        self._menus: OrderedDictT["Menu", _MenuScope] = OrderedDict()
+        self._by_guild: Dict[int, OrderedDictT["Menu", None]] = {}
+        self._by_channel: Dict[int, OrderedDictT["Menu", None]] = {}
+        self._by_user: Dict[int, OrderedDictT["Menu", None]] = {}
+
+    def __len__(self) -> int:
+        return len(self._menus)
+
+    def __contains__(self, menu: "Menu") -> bool:
+        return menu in self._menus
+
+    def _buckets(self, scope: _MenuScope):
+        # yields the existing per-scope mappings of a menu with their limits
+        for key, mapping, limit in (
+            (scope.user_id, self._by_user, self.max_per_user),
+            (scope.channel_id, self._by_channel, self.max_per_channel),
+            (scope.guild_id, self._by_guild, self.max_per_guild),
+        ):
+            if key is not None:
+                yield key, mapping, limit
+
+    async def _admit(
+        self,
+        menu: "Menu",
+        interaction: Optional[nextcord.Interaction],
+        channel: nextcord.abc.Messageable,
+    ) -> bool:
+        if self.admission is None:
+            return True
+        return await self.admission._admit(menu, interaction, channel)
+
+    def _register(self, menu: "Menu", channel: Optional[nextcord.abc.Messageable]):
+        if menu in self._menus:
+            self._remove(menu)
+
+        guild = getattr(channel, "guild", None)
+        scope = _MenuScope(
+            guild_id=guild.id if guild is not None else None,
+            channel_id=getattr(channel, "id", None),
+            user_id=menu._author_id,
+        )
+        for key, mapping, limit in self._buckets(scope):
+            bucket = mapping.get(key)
+            while limit is not None and bucket and len(bucket) >= limit:
+                self._evict(next(iter(bucket)))
+        while self.max_menus is not None and len(self._menus) >= self.max_menus:
+            self._evict(next(iter(self._menus)))
+
+        self._menus[menu] = scope
+        for key, mapping, _ in self._buckets(scope):
+            mapping.setdefault(key, OrderedDict())[menu] = None
+        self.started += 1
+
+    def _remove(self, menu: "Menu") -> bool:
+        scope = self._menus.pop(menu, None)
+        if scope is None:
+            return False
+        for key, mapping, _ in self._buckets(scope):
+            bucket = mapping[key]
+            del bucket[menu]
+            if not bucket:
+                del mapping[key]
+        return True
+
+    def _evict(self, menu: "Menu"):
+        self._remove(menu)
+        self.evicted += 1
+        log.debug("Stopping menu %r to respect the limits of %r.", menu, self)
+        menu.stop()
+
+    def _unregister(self, menu: "Menu"):
+        if self._remove(menu):
+            self.finished += 1
+
+    def _touch(self, menu: "Menu"):
+        scope = self._menus.get(menu)
+        if scope is None:
+            return
+        self._menus.move_to_end(menu)
+        for key, mapping, _ in self._buckets(scope):
+            mapping[key].move_to_end(menu)
+
+    def menus(
+        self,
+        *,
+        guild_id: Optional[int] = None,
+        channel_id: Optional[int] = None,
+        user_id: Optional[int] = None,
+    ) -> List["Menu"]:
+        """Returns the running menus, from the least to the most recently used.
+
+        Parameters
+        ------------
+        guild_id: Optional[:class:`int`]
+            Only return the menus in this guild.
+        channel_id: Optional[:class:`int`]
+            Only return the menus in this channel.
+        user_id: Optional[:class:`int`]
+            Only return the menus started by this user.
+
+        Returns
+        ---------
+        List[:class:`Menu`]
+            The matching menus.
+        """
+        return [
+            menu
+            for menu, scope in self._menus.items()
+            if (guild_id is None or scope.guild_id == guild_id)
+            and (channel_id is None or scope.channel_id == channel_id)
+            and (user_id is None or scope.user_id == user_id)
+        ]
+
+    def count(
+        self,
+        *,
+        guild_id: Optional[int] = None,
+        channel_id: Optional[int] = None,
+        user_id: Optional[int] = None,
+    ) -> int:
+        """Returns the number of running menus in a scope.
+
+        With no arguments, this is the total number of running menus.
+
+        Parameters
+        ------------
+        guild_id: Optional[:class:`int`]
+            Only count the menus in this guild.
+        channel_id: Optional[:class:`int`]
+            Only count the menus in this channel.
+        user_id: Optional[:class:`int`]
+            Only count the menus started by this user.
+
+        Returns
+        ---------
+        :class:`int`
+            The number of matching menus.
+        """
+        filters = [
+            (key, mapping)
+            for key, mapping in (
+                (guild_id, self._by_guild),
+                (channel_id, self._by_channel),
+                (user_id, self._by_user),
+            )
+            if key is not None
+        ]
+        if not filters:
+            return len(self._menus)
+        if len(filters) == 1:
+            key, mapping = filters[0]
+            return len(mapping.get(key, ()))
+        return len(self.menus(guild_id=guild_id, channel_id=channel_id, user_id=user_id))
+
+    async def shutdown(self, *, concurrency: int = 8, deadline: Optional[float] = 30.0) -> int:
+        """|coro|
+
+        Stops every running menu and finalizes their messages in bulk.
+
+        This should be awaited before closing the bot, since menus that are
+        still running when it closes leave their messages untouched.
+        The messages of each channel are handled one after the other, to stay
+        within its rate limits, while up to ``concurrency`` channels are handled
+        at once. The messages of menus with ``delete_message_after`` are
+        deleted with a single bulk delete per channel where possible.
+
+        Menus with a :class:`MenuPersistence` are left running, so that they
+        can be reattached after a restart.
+
+        Parameters
+        ------------
+        concurrency: :class:`int`
+            The number of channels to handle at once. Defaults to ``8``.
+        deadline: Optional[:class:`float`]
+            The number of seconds after which the remaining messages are left
+            as they are. Defaults to ``30.0``, ``None`` waits for all of them.
+
+        Returns
+        ---------
+        :class:`int`
+            The number of menus whose message was finalized in time.
+        """
+        by_channel: Dict[Optional[int], List["Menu"]] = {}
+        for menu, scope in list(self._menus.items()):
+            if getattr(menu, "_persistence", None) is not None:
+                continue
+            # the messages are finalized below instead of by each menu
+            menu._leave_message = True
+            menu.stop()
+            by_channel.setdefault(scope.channel_id, []).append(menu)
+
+        semaphore = asyncio.Semaphore(concurrency)
+        finalized = 0
+
+        async def finalize_channel(menus: List["Menu"]):
+            nonlocal finalized
+            async with semaphore:
+                deletable = [
+                    menu.message
+                    for menu in menus
+                    if menu.delete_message_after and isinstance(menu.message, nextcord.Message)
+                ]
+                deleted = await self._bulk_delete(deletable)
+                finalized += len(deleted)
+                for menu in menus:
+                    message = menu.message
+                    if isinstance(message, nextcord.Message) and message.id in deleted:
+                        continue
+                    try:
+                        await menu._finalize_message()
+                    except Exception:
+                        log.exception("Failed to finalize the message of menu %r.", menu)
+                    else:
+                        finalized += 1
+
+        tasks = [asyncio.ensure_future(finalize_channel(menus)) for menus in by_channel.values()]
+        if not tasks:
+            return 0
+        _, pending = await asyncio.wait(tasks, timeout=deadline)
+        for task in pending:
+            task.cancel()
+        if pending:
+            log.warning(
+                "Shutdown deadline reached, %d channels of menus were left as they are.",
+                len(pending),
+            )
+        return finalized
+
+    async def _bulk_delete(self, messages: List[nextcord.Message]) -> Set[int]:
+        # returns the IDs of the deleted messages, the others are to be finalized one by one
+        if len(messages) < 2:
+            return set()
+        channel = messages[0].channel
+        if not hasattr(channel, "delete_messages"):
+            return set()
+        deleted: Set[int] = set()
+        try:
+            # bulk deletes are limited to 100 messages
+            for start in range(0, len(messages), 100):
+                chunk = messages[start : start + 100]
+                await channel.delete_messages(chunk)  # type: ignore
+                deleted.update(message.id for message in chunk)
+        except nextcord.HTTPException:
+            # e.g. messages older than two weeks, which cannot be bulk deleted
+            log.debug("Bulk delete failed in %r, deleting messages one by one.", channel)
+            for message in messages:
+                if message.id in deleted:
+                    continue
+                try:
+                    await message.delete()
+                except nextcord.HTTPException:
+                    pass
+                else:
+                    deleted.add(message.id)
+        return deleted
+
+    def __repr__(self) -> str:
+        return (
+            "<{0.__class__.__name__} menus={1} max_menus={0.max_menus} "
+            "max_per_guild={0.max_per_guild} max_per_channel={0.max_per_channel} "
+            "max_per_user={0.max_per_user}>".format(self, len(self._menus))
+        )
@@ -1,13 +1,42 @@
-from typing import Any, List, Optional, Union
+import asyncio
+import time
+from typing import TYPE_CHECKING, Any, Callable, List, NamedTuple, Optional, Set, Union
 
 import nextcord
-from nextcord.ext import commands
 
-from .constants import PageFormatType, SendKwargsType
+from .constants import PageFormatType, SendKwargsType, log
+from .instrumentation import _notify, _observers
 from .menus import Button, ButtonMenu, Menu
-from .page_source import PageSource
+from .page_source import (
+    AsyncIteratorPageSource,
+    FilterablePageSource,
+    OffsetPageSource,
+    PageSource,
+    SortablePageSource,
+)
 from .utils import First, Last, _cast_emoji
 
+if TYPE_CHECKING:
+    from nextcord.ext import commands
+
+    from .persistence import MenuPersistence
+
+
+class FormatPageTimings(NamedTuple):
+    """Named tuple representing how long a :func:`cpu_bound`
+    :meth:`PageSource.format_page` call took.
+
+    Attributes
+    ------------
+    queue_time: :class:`float`
+        The time in seconds the call waited for a free worker of the executor.
+    run_time: :class:`float`
+        The time in seconds the call took to run in the executor.
+    """
+
+    queue_time: float
+    run_time: float
+
 
 class MenuPagesBase(Menu):
     """A base class dedicated to pagination for reaction and button menus.
@@ -17,6 +46,9 @@ class MenuPagesBase(Menu):
     current_page: :class:`int`
         The current page that we are in. Zero-indexed
         between [0, :attr:`PageSource.max_pages`).
+    last_format_timings: Optional[:class:`FormatPageTimings`]
+        The timings of the last :meth:`PageSource.format_page` call that was
+        run in an executor because it was marked with :func:`cpu_bound`, if any.
     """
 
     FIRST_PAGE = "\N{BLACK LEFT-POINTING DOUBLE TRIANGLE WITH VERTICAL BAR}\ufe0f"
@@ -24,10 +56,18 @@ class MenuPagesBase(Menu):
     NEXT_PAGE = "\N{BLACK RIGHT-POINTING TRIANGLE}\ufe0f"
     LAST_PAGE = "\N{BLACK RIGHT-POINTING DOUBLE TRIANGLE WITH VERTICAL BAR}\ufe0f"
     STOP = "\N{BLACK SQUARE FOR STOP}\ufe0f"
+    SEARCH = "\N{LEFT-POINTING MAGNIFYING GLASS}"
+    JUMP = "\N{INPUT SYMBOL FOR NUMBERS}"
 
     def __init__(self, source: PageSource, **kwargs):
         self._source = source
         self.current_page = 0
+        self._max_pages_task: Optional[asyncio.Task] = None
+        # the page loads of the menu, cancelled when it stops
+        self._page_loads: Set[asyncio.Future] = set()
+        self.last_format_timings: Optional[FormatPageTimings] = None
+        # turned off by the admission controller while the bot is under load
+        self._prefetch = True
         if isinstance(self, ButtonMenu):
             ButtonMenu.__init__(self, **kwargs)
             return
@@ -58,9 +98,143 @@ class MenuPagesBase(Menu):
 
         self._source = source
         self.current_page = 0
+        if self.message is None:
+            # the components are laid out for the new source when the menu starts
+            await self._refresh_pagination_buttons()
+            return
+        await source._prepare_once()
+        self._watch_max_pages()
+        await self._refresh_pagination_buttons()
+        await self.show_page(0)
+
+    def _watch_max_pages(self):
+        # Sources that learn their length in the background notify the menu once it is known
+        if self._max_pages_task is not None:
+            self._max_pages_task.cancel()
+            self._max_pages_task = None
+
+        source = self._source
+        if isinstance(source, AsyncIteratorPageSource) and source.get_max_pages() is None:
+            self._max_pages_task = asyncio.ensure_future(self._wait_for_max_pages(source))
+
+    async def _wait_for_max_pages(self, source: AsyncIteratorPageSource):
+        max_pages = await source.wait_for_max_pages()
+        if max_pages is None or source is not self._source or not self._running:
+            return
+        try:
+            await self.on_max_pages_known()
+        except Exception as exc:
+            await self.on_menu_button_error(exc)
+
+    async def on_max_pages_known(self):
+        """|coro|
+
+        Called when the maximum number of pages of a source that did not
+        know it up front becomes known, such as an :class:`AsyncIteratorPageSource`
+        with a ``count`` or ``exhaust_in_background``.
+
+        The default implementation enables the first and last page buttons
+        and re-renders the current page if the message has been sent, so that
+        page counts shown by :meth:`PageSource.format_page` are updated.
+        """
+        await self._refresh_pagination_buttons()
+        if self.message is not None:
+            await self.show_current_page()
+
+    async def _prepare_source(self):
+        # Sources such as OffsetPageSource only learn their number of pages when
+        # they are prepared, after the buttons were laid out for an unknown count
+        max_pages = self._source.get_max_pages()
+        if _observers:
+            started = time.perf_counter()
+            await self._source._prepare_once()
+            _notify(self, "prepare", started)
+        else:
+            await self._source._prepare_once()
+        if self._source.get_max_pages() != max_pages:
+            await self._refresh_pagination_buttons()
+
+    async def _refresh_pagination_buttons(self):
+        # Recompute which reaction buttons are valid after the number of pages changed
+        previous = set(self.buttons)
+        del self.buttons
+
+        if isinstance(self.message, nextcord.Message) and self.should_add_reactions():
+            for emoji in self.buttons:
+                if emoji not in previous:
+                    await self.message.add_reaction(emoji)
+
+    async def search(self, query: Optional[str]) -> int:
+        """|coro|
+
+        Filters the entries of the :class:`FilterablePageSource` of the menu
+        to the ones matching a query and shows the first page of the results.
+
+        If no entry matches the query, the previous filter is kept and the
+        current page stays as it is.
+
+        Parameters
+        ------------
+        query: Optional[:class:`str`]
+            The query to search for. If it is ``None`` or has no words
+            then the filter is removed.
+
+        Raises
+        --------
+        TypeError
+            The source of the menu is not a :class:`FilterablePageSource`.
+
+        Returns
+        ---------
+        :class:`int`
+            The number of matching entries, ``0`` if nothing matched.
+        """
+        if not isinstance(self._source, FilterablePageSource):
+            raise TypeError(
+                "Expected {0!r} not {1.__class__!r}.".format(FilterablePageSource, self._source)
+            )
+
+        previous = self._source.query
+        matches = self._source.search(query)
+        if not matches and self._source.query is not None:
+            # there would be no page to show
+            self._source.search(previous)
+            return 0
+
+        self.current_page = 0
+        await self._refresh_pagination_buttons()
         if self.message is not None:
-            await source._prepare_once()
             await self.show_page(0)
+        return matches
+
+    async def sort_by(self, order: Optional[str], *, reverse: bool = False):
+        """|coro|
+
+        Changes the order of the entries of the :class:`SortablePageSource`
+        of the menu and shows the current page again in the new order.
+
+        Parameters
+        ------------
+        order: Optional[:class:`str`]
+            The name of the order or ``None`` for the original order.
+        reverse: :class:`bool`
+            Whether to reverse the order.
+
+        Raises
+        --------
+        TypeError
+            The source of the menu is not a :class:`SortablePageSource`.
+        KeyError
+            There is no order with that name.
+        """
+        if not isinstance(self._source, SortablePageSource):
+            raise TypeError(
+                "Expected {0!r} not {1.__class__!r}.".format(SortablePageSource, self._source)
+            )
+
+        self._source.sort_by(order, reverse=reverse)
+        if self.message is not None:
+            await self.show_current_page()
 
     def should_add_reactions(self) -> bool:
         return super().should_add_reactions() and self._source.is_paginating()
@@ -80,36 +254,109 @@ class MenuPagesBase(Menu):
             :class:`str`, :class:`nextcord.Embed`, List[:class:`nextcord.Embed`],
             or :class:`dict`.
         """
-        value: PageFormatType = await nextcord.utils.maybe_coroutine(
-            self._source.format_page, self, page
-        )
+        format_page = self._source._get_format_page()
+        observed = bool(_observers)
+        started = time.perf_counter() if observed else 0.0
+        admission = self.manager.admission if self.manager is not None else None
+        if admission is not None:
+            admission.renders += 1
+        try:
+            if getattr(format_page, "__menu_cpu_bound__", False):
+                value = await self._format_page_in_executor(format_page, page)
+            else:
+                value = await nextcord.utils.maybe_coroutine(format_page, self, page)
+        finally:
+            if admission is not None:
+                admission.renders -= 1
+        self.trace._record("render", self.current_page)
+        if observed:
+            _notify(self, "format_page", started, self.current_page)
+            started = time.perf_counter()
+
         if isinstance(value, dict):
-            return value
+            kwargs = value
         elif isinstance(value, str):
-            return {"content": value}
+            kwargs = {"content": value}
         elif isinstance(value, nextcord.Embed):
-            return {"embed": value}
+            kwargs = {"embed": value}
         elif isinstance(value, list) and all(isinstance(v, nextcord.Embed) for v in value):
-            return {"embeds": value}
-        raise TypeError(
-            "Expected {0!r} not {1.__class__!r}.".format(
-                (dict, str, nextcord.Embed, List[nextcord.Embed]), value
+            kwargs = {"embeds": value}
+        else:
+            raise TypeError(
+                "Expected {0!r} not {1.__class__!r}.".format(
+                    (dict, str, nextcord.Embed, List[nextcord.Embed]), value
+                )
             )
+        if observed:
+            _notify(self, "normalize", started, self.current_page)
+        return kwargs
+
+    async def _load_page(self, page_number: int) -> Any:
+        if not isinstance(self._source, OffsetPageSource):
+            return await self._source.get_page(page_number)
+        # the source may be shared with other menus, so the loads of this one
+        # are tracked to only cancel them when it stops
+        task = asyncio.ensure_future(self._source.get_page(page_number))
+        self._page_loads.add(task)
+        task.add_done_callback(self._page_loads.discard)
+        return await task
+
+    async def _get_page(self, page_number: int) -> Any:
+        # gets a page from the source, timing it if anyone is observing menus
+        if not _observers:
+            return await self._load_page(page_number)
+        cache_hit = self._source._is_cached(page_number)
+        started = time.perf_counter()
+        page = await self._load_page(page_number)
+        _notify(self, "get_page", started, page_number, cache_hit)
+        return page
+
+    async def _format_page_in_executor(
+        self, format_page: Callable[..., PageFormatType], page: Any
+    ) -> PageFormatType:
+        loop = asyncio.get_running_loop()
+        submitted = time.perf_counter()
+        started = finished = submitted
+
+        def run() -> PageFormatType:
+            nonlocal started, finished
+            started = time.perf_counter()
+            try:
+                return format_page(self, page)
+            finally:
+                finished = time.perf_counter()
+
+        value = await loop.run_in_executor(format_page.__menu_executor__, run)  # type: ignore
+        self.last_format_timings = timings = FormatPageTimings(
+            queue_time=started - submitted, run_time=finished - started
+        )
+        log.debug(
+            "%s formatted page %s in %.2fms after %.2fms in the executor queue.",
+            self.__class__.__name__,
+            self.current_page,
+            timings.run_time * 1000,
+            timings.queue_time * 1000,
         )
+        return value
 
     async def show_page(self, page_number: int):
         """|coro|
 
         Sets the current page to the specified page and shows it.
         """
-        page = await self._source.get_page(page_number)
+        page = await self._get_page(page_number)
         self.current_page = page_number
         kwargs = await self._get_kwargs_from_page(page)
         assert self.message is not None, "Cannot show page without a message."
-        await self.message.edit(**kwargs)
+        if not _observers:
+            await self._edit_message(**kwargs)
+            return
+        started = time.perf_counter()
+        await self._edit_message(**kwargs)
+        _notify(self, "edit", started, page_number)
 
     async def send_initial_message(
-        self, ctx: commands.Context, channel: nextcord.abc.Messageable
+        self, ctx: "commands.Context", channel: nextcord.abc.Messageable
     ) -> Union[nextcord.Message, nextcord.PartialInteractionMessage]:
         """|coro|
 
@@ -118,42 +365,35 @@ class MenuPagesBase(Menu):
 
         This implementation shows the first page of the source.
         """
-        page = await self._source.get_page(0)
+        page = await self._get_page(0)
         kwargs = await self._get_kwargs_from_page(page)
         # filter out kwargs that are "None"
         kwargs = {k: v for k, v in kwargs.items() if v is not None}
         # if we're not paginating, we can remove the pagination buttons
         if not self._source.is_paginating():
             await self.clear()
+        observed = bool(_observers)
+        started = time.perf_counter() if observed else 0.0
         # if there is an interaction, send an interaction response
         # unless the user has specified a different channel than the interaction channel
+        self._http_calls += 1
         if self.interaction is not None and channel == self.interaction.channel:
             message = await self.interaction.send(ephemeral=self.ephemeral, **kwargs)
             # if we are adding reactions, we need the full interaction message
             if isinstance(message, nextcord.PartialInteractionMessage) and self.buttons:
-                return await self.interaction.original_message()
+                self._http_calls += 1
+                message = await self.interaction.original_message()
             # if we are only adding view buttons, we can return a PartialInteractionMessage or WebhookMessage
-            return message
-        # otherwise, send the message using the channel
-        return await channel.send(**kwargs)
+        else:
+            # otherwise, send the message using the channel
+            message = await channel.send(**kwargs)
+        if observed:
+            _notify(self, "send", started, 0)
+        return message
 
-    async def start(
-        self,
-        ctx: Optional[commands.Context] = None,
-        interaction: Optional[nextcord.Interaction] = None,
-        *,
-        channel: Optional[nextcord.abc.Messageable] = None,
-        wait: bool = False,
-        ephemeral: bool = False,
-    ):
-        await self._source._prepare_once()
-        await super().start(
-            ctx=ctx,
-            interaction=interaction,
-            channel=channel,
-            wait=wait,
-            ephemeral=ephemeral,
-        )
+    async def _prepare(self):
+        await self._prepare_source()
+        self._watch_max_pages()
 
     async def show_checked_page(self, page_number: int):
         max_pages = self._source.get_max_pages()
@@ -196,6 +436,28 @@ class MenuPagesBase(Menu):
         """stops the pagination session."""
         self.stop()
 
+    def stop(self):
+        if self._max_pages_task is not None:
+            self._max_pages_task.cancel()
+            self._max_pages_task = None
+        # don't keep fetching pages that nobody is going to see
+        for task in self._page_loads:
+            task.cancel()
+        super().stop()
+
+
+# stable custom IDs of the pagination components of persistent menus
+PERSISTENT_CUSTOM_IDS = {
+    MenuPagesBase.FIRST_PAGE: "nextcord-ext-menus:first",
+    MenuPagesBase.PREVIOUS_PAGE: "nextcord-ext-menus:previous",
+    MenuPagesBase.NEXT_PAGE: "nextcord-ext-menus:next",
+    MenuPagesBase.LAST_PAGE: "nextcord-ext-menus:last",
+    MenuPagesBase.JUMP: "nextcord-ext-menus:jump",
+    MenuPagesBase.SEARCH: "nextcord-ext-menus:search",
+    MenuPagesBase.STOP: "nextcord-ext-menus:stop",
+}
+PERSISTENT_SELECT_CUSTOM_ID = "nextcord-ext-menus:page-select"
+
 
 class MenuPages(MenuPagesBase):
     """A special type of Menu dedicated to pagination with reactions.
@@ -249,9 +511,12 @@ class MenuPaginationButton(nextcord.ui.Button["ButtonMenuPages"]):
     """
 
     def __init__(self, **kwargs):
-        super().__init__(**kwargs)
         emoji = kwargs.get("emoji", None)
         self._emoji = _cast_emoji(emoji) if emoji else None
+        if self._emoji is not None:
+            # share the parsed emoji instead of parsing it again
+            kwargs["emoji"] = self._emoji
+        super().__init__(**kwargs)
 
     async def callback(self, interaction: nextcord.Interaction):
         """
@@ -261,18 +526,197 @@ class MenuPaginationButton(nextcord.ui.Button["ButtonMenuPages"]):
             return
 
         assert self.view is not None
+        self.view.trace._record("button", self._emoji)
+        if not _observers:
+            await self._paginate(interaction)
+            return
+        pressed = time.perf_counter()
+        try:
+            await self._paginate(interaction)
+        finally:
+            _notify(self.view, "press", pressed, self.view.current_page)
+
+    async def _paginate(self, interaction: nextcord.Interaction):
+        assert self.view is not None
 
         # change the current page
-        if str(self._emoji) == self.view.FIRST_PAGE:
+        emoji = str(self._emoji)
+        if emoji == self.view.FIRST_PAGE:
             await self.view.go_to_first_page()
-        elif str(self._emoji) == self.view.PREVIOUS_PAGE:
+        elif emoji == self.view.PREVIOUS_PAGE:
             await self.view.go_to_previous_page()
-        elif str(self._emoji) == self.view.NEXT_PAGE:
+        elif emoji == self.view.NEXT_PAGE:
             await self.view.go_to_next_page()
-        elif str(self._emoji) == self.view.LAST_PAGE:
+        elif emoji == self.view.LAST_PAGE:
             await self.view.go_to_last_page()
-        elif str(self._emoji) == self.view.STOP:
+        elif emoji == self.view.STOP:
             await self.view.stop_pages()
+        elif emoji == self.view.SEARCH:
+            await interaction.response.send_modal(MenuSearchModal(self.view))
+        elif emoji == self.view.JUMP:
+            await interaction.response.send_modal(MenuJumpModal(self.view))
+
+
+class MenuJumpModal(nextcord.ui.Modal):
+    """
+    A modal asking for a page number used by :class:`ButtonMenuPages`
+    when ``jump_to_page`` is enabled.
+
+    Submitting it calls :meth:`ButtonMenuPages.show_checked_page` with the page.
+
+    This is a subclass of :class:`nextcord.ui.Modal`.
+
+    Parameters
+    -----------
+    menu: :class:`ButtonMenuPages`
+        The menu to change the page of.
+    title: :class:`str`
+        The title of the modal. Defaults to ``Go to page``.
+    """
+
+    def __init__(self, menu: "ButtonMenuPages", *, title: str = "Go to page"):
+        super().__init__(title, timeout=menu.timeout)
+        self.menu = menu
+        max_pages = menu.source.get_max_pages()
+        self.page = nextcord.ui.TextInput(
+            label="Page",
+            min_length=1,
+            max_length=10,
+            placeholder=f"1-{max_pages}" if max_pages else None,
+        )
+        self.add_item(self.page)
+
+    async def callback(self, interaction: nextcord.Interaction):
+        """
+        Callback for when the modal is submitted
+        """
+        if not interaction.response.is_done():
+            await interaction.response.defer()
+        try:
+            page_number = int(self.page.value or "") - 1
+        except ValueError:
+            return
+        await self.menu.show_checked_page(page_number)
+
+
+class MenuPageSelect(nextcord.ui.Select["ButtonMenuPages"]):
+    """
+    A select menu for jumping to any page used by :class:`ButtonMenuPages`
+    when ``page_select`` is enabled.
+
+    As a select menu is limited to 25 options, pages are grouped into ranges
+    of a power of ten pages so that there are at most 24 of them. Selecting a
+    range shows the smaller ranges or pages within it, so any of thousands of
+    pages can be reached in a few selections. The first page of a selected range
+    is prefetched from the source while the next selection is made.
+
+    This is a subclass of :class:`nextcord.ui.Select` and as
+    such, accepts all of its parameters.
+
+    Parameters
+    -----------
+    max_pages: :class:`int`
+        The number of pages to choose from.
+    """
+
+    def __init__(self, max_pages: int, **kwargs):
+        kwargs.setdefault("placeholder", "Go to page")
+        super().__init__(**kwargs)
+        self.max_pages = max_pages
+        self._set_range(0, max_pages)
+
+    def _set_range(self, start: int, stop: int):
+        step = 1
+        while -(-(stop - start) // step) > 24:
+            step *= 10
+
+        options = []
+        if start != 0 or stop != self.max_pages:
+            options.append(nextcord.SelectOption(label="All pages", value="all"))
+        for first in range(start, stop, step):
+            last = min(first + step, stop)
+            if last - first == 1:
+                options.append(nextcord.SelectOption(label=f"Page {first + 1}", value=f"{first}"))
+            else:
+                options.append(
+                    nextcord.SelectOption(
+                        label=f"Pages {first + 1}-{last}", value=f"{first}:{last}"
+                    )
+                )
+        self.options = options
+
+    async def callback(self, interaction: nextcord.Interaction):
+        """
+        Callback for when an option is selected
+        """
+        await self._select(interaction, self.values[0])
+
+    async def _select(self, interaction: nextcord.Interaction, value: str):
+        assert self.view is not None
+
+        if value == "all":
+            self._set_range(0, self.max_pages)
+        elif ":" in value:
+            start, stop = map(int, value.split(":"))
+            self._set_range(start, stop)
+            self.view._prefetch_page(start)
+        else:
+            await interaction.response.defer()
+            await self.view.show_checked_page(int(value))
+            return
+        # show the new options
+        await interaction.response.edit_message(view=self.view)
+
+
+class MenuSearchModal(nextcord.ui.Modal):
+    """
+    A modal asking for a search query used by :class:`ButtonMenuPages`
+    when its source is a :class:`FilterablePageSource`.
+
+    Submitting it calls :meth:`ButtonMenuPages.search` with the query.
+
+    This is a subclass of :class:`nextcord.ui.Modal`.
+
+    Parameters
+    -----------
+    menu: :class:`ButtonMenuPages`
+        The menu to search in.
+    title: :class:`str`
+        The title of the modal. Defaults to ``Search``.
+    no_results: Optional[:class:`str`]
+        The ephemeral message sent when nothing matches the query, the menu
+        then stays on its current page. ``None`` sends nothing. Defaults to
+        ``No entries match this search.``
+    """
+
+    def __init__(
+        self,
+        menu: "ButtonMenuPages",
+        *,
+        title: str = "Search",
+        no_results: Optional[str] = "No entries match this search.",
+    ):
+        super().__init__(title, timeout=menu.timeout)
+        self.menu = menu
+        self.no_results = no_results
+        query = menu.source.query if isinstance(menu.source, FilterablePageSource) else None
+        self.query = nextcord.ui.TextInput(
+            label="Query",
+            required=False,
+            max_length=100,
+            default_value=query,
+            placeholder="Leave empty to show everything",
+        )
+        self.add_item(self.query)
+
+    async def callback(self, interaction: nextcord.Interaction):
+        """
+        Callback for when the modal is submitted
+        """
+        if not interaction.response.is_done():
+            await interaction.response.defer()
+        if not await self.menu.search(self.query.value) and self.no_results is not None:
+            await interaction.followup.send(self.no_results, ephemeral=True)
 
 
 class ButtonMenuPages(MenuPagesBase, ButtonMenu):
@@ -282,6 +726,20 @@ class ButtonMenuPages(MenuPagesBase, ButtonMenu):
     -----------
     style: :class:`nextcord.ui.ButtonStyle`
         The button style to use for the pagination buttons.
+    jump_to_page: :class:`bool`
+        Whether to add a button opening a :class:`MenuJumpModal` to go to
+        any page by its number. Defaults to ``False``.
+    page_select: :class:`bool`
+        Whether to add a :class:`MenuPageSelect` to go to any page by narrowing
+        down ranges of pages. It is only added once the maximum number of pages
+        is known. Defaults to ``False``.
+    persistence: Optional[:class:`MenuPersistence`]
+        The persistence layer to record the state of the menu in, so that it can
+        be reattached after the bot restarts. The components then use stable
+        custom IDs and the menu has no timeout. Defaults to ``None``.
+    source_key: Optional[:class:`str`]
+        The key passed to the source factory of ``persistence`` to rebuild
+        the source of the menu. Required if ``persistence`` is given.
 
     Attributes
     ------------
@@ -294,9 +752,25 @@ class ButtonMenuPages(MenuPagesBase, ButtonMenu):
         self,
         source: PageSource,
         style: nextcord.ButtonStyle = nextcord.ButtonStyle.secondary,
+        *,
+        jump_to_page: bool = False,
+        page_select: bool = False,
+        persistence: Optional["MenuPersistence"] = None,
+        source_key: Optional[str] = None,
         **kwargs,
     ):
+        if persistence is not None and source_key is None:
+            raise ValueError("source_key must be set when persistence is used.")
+        if persistence is not None:
+            # only views without a timeout keep receiving clicks after a restart
+            if kwargs.setdefault("timeout", None) is not None:
+                raise ValueError("timeout must be None when persistence is used.")
         self.__button_menu_pages__ = True
+        self._style = style
+        self._jump_to_page = jump_to_page
+        self._page_select = page_select
+        self._persistence = persistence
+        self.source_key = source_key
         # make button pagination disable buttons on stop by default unless it's overridden
         if "disable_buttons_after" not in kwargs:
             kwargs["disable_buttons_after"] = True
@@ -304,22 +778,70 @@ class ButtonMenuPages(MenuPagesBase, ButtonMenu):
         # skip adding buttons if inherit_buttons=False was passed to metaclass or only one page
         if not self.__inherit_buttons__ or not self.should_add_buttons():  # type: ignore
             return
+        self._add_pagination_buttons(style)
+
+    def _add_pagination_buttons(self, style: nextcord.ButtonStyle):
         # add buttons to the view
         pagination_emojis = (
             self.FIRST_PAGE,
             self.PREVIOUS_PAGE,
             self.NEXT_PAGE,
             self.LAST_PAGE,
+            self.JUMP,
+            self.SEARCH,
             self.STOP,
         )
         double_triangle_emojis = {self.FIRST_PAGE, self.LAST_PAGE}
         for emoji in pagination_emojis:
             if emoji in double_triangle_emojis and self._skip_double_triangle_buttons():
                 continue
-            self.add_item(MenuPaginationButton(emoji=emoji, style=style))
+            if emoji == self.SEARCH and not isinstance(self._source, FilterablePageSource):
+                continue
+            if emoji == self.JUMP and not self._jump_to_page:
+                continue
+            kwargs = {}
+            if self._persistence is not None:
+                # stable custom IDs so that the components can be reattached after a restart
+                kwargs["custom_id"] = PERSISTENT_CUSTOM_IDS[emoji]
+            self.add_item(MenuPaginationButton(emoji=emoji, style=style, **kwargs))
+        max_pages = self._source.get_max_pages()
+        if self._page_select and max_pages is not None and max_pages > 1:
+            kwargs = {}
+            if self._persistence is not None:
+                kwargs["custom_id"] = PERSISTENT_SELECT_CUSTOM_ID
+            self.add_item(MenuPageSelect(max_pages, **kwargs))
         # disable buttons that are not available
         self._disable_unavailable_buttons()
 
+    async def _refresh_pagination_buttons(self):
+        pagination_buttons = [
+            child for child in self.children if isinstance(child, MenuPaginationButton)
+        ]
+        if not pagination_buttons:
+            # the buttons were skipped because the source did not need them yet
+            if self.__inherit_buttons__ and self.should_add_buttons():  # type: ignore
+                self._add_pagination_buttons(self._style)
+            return
+        # re-add the pagination buttons so that they keep their order
+        style = pagination_buttons[0].style
+        for child in self.children.copy():
+            if isinstance(child, (MenuPaginationButton, MenuPageSelect)):
+                self.remove_item(child)
+        self._add_pagination_buttons(style)
+
+    def _prefetch_page(self, page_number: int):
+        # warm up the caches of the source for a page that is likely to be shown next
+        if not self._prefetch:
+            return
+
+        async def prefetch():
+            try:
+                await self._load_page(page_number)
+            except Exception:
+                pass
+
+        asyncio.ensure_future(prefetch())
+
     def should_add_buttons(self) -> bool:
         return self._source.is_paginating()
 
@@ -332,6 +854,30 @@ class ButtonMenuPages(MenuPagesBase, ButtonMenu):
         self._disable_unavailable_buttons()
         # show the page
         await super().show_page(page_number)
+        if self._persistence is not None:
+            self._persistence._schedule_save(self)
+
+    async def interaction_check(self, interaction: nextcord.Interaction) -> bool:
+        if not await super().interaction_check(interaction):
+            return False
+        if self._persistence is not None:
+            self._persistence._touch(self)
+        return True
+
+    async def _internal_loop(self):
+        if self._persistence is None:
+            return await super()._internal_loop()
+
+        await self._persistence._save(self)
+        try:
+            await super()._internal_loop()
+        finally:
+            # the menu is done unless it only stopped because the bot is shutting
+            # down, or because it was hibernated and left its message as is
+            if not (self.bot and self.bot.is_closed()) and not self._leave_message:
+                await self._persistence._forget(self)
+            else:
+                await self._persistence._flush(self)
 
     async def _get_kwargs_from_page(self, page: List[Any]) -> SendKwargsType:
         """|coro|
@@ -357,5 +903,8 @@ class ButtonMenuPages(MenuPagesBase, ButtonMenu):
             if isinstance(child, nextcord.ui.Button):
                 if str(child.emoji) in (self.FIRST_PAGE, self.PREVIOUS_PAGE):
                     child.disabled = self.current_page == 0
-                elif max_pages and str(child.emoji) in (self.LAST_PAGE, self.NEXT_PAGE):
-                    child.disabled = self.current_page == max_pages - 1
+                elif max_pages is not None and str(child.emoji) in (
+                    self.LAST_PAGE,
+                    self.NEXT_PAGE,
+                ):
+                    child.disabled = self.current_page >= max_pages - 1
@@ -1,22 +1,26 @@
 import asyncio
 import inspect
+import time
 from collections import OrderedDict
 from typing import (
     TYPE_CHECKING,
     Any,
     Callable,
+    ClassVar,
     Coroutine,
+    Dict,
+    Iterable,
     Mapping,
     NoReturn,
     Optional,
     OrderedDict,
+    Tuple,
     Union,
 )
 
 from nextcord.permissions import Permissions
 
 import nextcord
-from nextcord.ext import commands
 
 from .constants import DEFAULT_TIMEOUT, EmojiType, log
 from .exceptions import (
@@ -26,7 +30,14 @@ from .exceptions import (
     CannotSendMessages,
     MenuError,
 )
-from .utils import Position, _cast_emoji
+from .instrumentation import _notify, _notify_finish, _notify_start, _observers
+from .tracing import MenuTrace
+from .utils import Position, _cast_emoji, _emoji_key
+
+if TYPE_CHECKING:
+    from nextcord.ext import commands
+
+    from .manager import MenuManager
 
 
 class Button:
@@ -55,12 +66,16 @@ class Button:
         Note that since Discord does not actually maintain reaction
         order, this is a best effort attempt to have an order until
         the user restarts their client. Defaults to ``Position(0)``.
-    lock: :class:`bool`
-        Whether the button should lock all other buttons from being processed
-        until this button is done. Defaults to ``True``.
+    lock: Union[:class:`bool`, :class:`str`, Iterable[:class:`str`]]
+        The lock groups of the button. A button is not processed while another
+        button sharing one of its groups is being processed, but buttons with
+        no group in common run concurrently. ``True`` is the default group,
+        a string is a named group, and an iterable of strings makes the button
+        part of all of these groups, e.g. for an action conflicting with
+        several others. ``False`` does not lock anything. Defaults to ``True``.
     """
 
-    __slots__ = ("emoji", "_action", "_skip_if", "position", "lock")
+    __slots__ = ("emoji", "_action", "_skip_if", "position", "_lock", "_lock_groups")
 
     if TYPE_CHECKING:
         emoji: nextcord.PartialEmoji
@@ -72,7 +87,7 @@ class Button:
         *,
         skip_if: Optional[Callable[..., bool]] = None,
         position: Optional[Position] = None,
-        lock: Optional[bool] = True,
+        lock: Union[bool, str, Iterable[str], None] = True,
     ):
         self.emoji = _cast_emoji(emoji)
         self.action = action
@@ -80,6 +95,26 @@ class Button:
         self.position = position or Position(0)
         self.lock = lock
 
+    @property
+    def lock(self) -> Union[bool, str, Iterable[str], None]:
+        return self._lock
+
+    @lock.setter
+    def lock(self, value: Union[bool, str, Iterable[str], None]):
+        self._lock = value
+        # the default group is None, and the groups are always acquired
+        # in the same order so that buttons sharing several cannot deadlock
+        groups: Iterable[Optional[str]]
+        if value is True:
+            groups = (None,)
+        elif not value:
+            groups = ()
+        elif isinstance(value, str):
+            groups = (value,)
+        else:
+            groups = sorted(set(value))
+        self._lock_groups: Tuple[Optional[str], ...] = tuple(groups)
+
     @property
     def skip_if(self) -> Optional[Callable[..., bool]]:
         return self._skip_if
@@ -260,8 +295,16 @@ class Menu(metaclass=_MenuMeta):
     ephemeral: :class:`bool`
         Whether to make the response ephemeral when using an interaction response.
         Note: Ephemeral messages do not support reactions.
+    manager: Optional[:class:`MenuManager`]
+        The registry limiting the number of running menus this menu is part of.
+    trace: :class:`MenuTrace`
+        The latest lifecycle events of the menu, which are logged along with
+        unhandled exceptions of buttons. Its size is set by the :attr:`trace_size`
+        class attribute, which defaults to ``32``, ``0`` disabling it.
     """
 
+    trace_size: ClassVar[int] = 32
+
     def __init__(
         self,
         *,
@@ -270,6 +313,7 @@ class Menu(metaclass=_MenuMeta):
         clear_reactions_after: bool = False,
         check_embeds: bool = False,
         message: Optional[Union[nextcord.Message, nextcord.PartialInteractionMessage]] = None,
+        manager: Optional["MenuManager"] = None,
     ):
         self.timeout = timeout
         self.delete_message_after = delete_message_after
@@ -278,14 +322,24 @@ class Menu(metaclass=_MenuMeta):
         self._can_remove_reactions = False
         self.__tasks = []
         self._running = True
+        self._leave_message = False
+        # the number of requests made by the menu, for the metrics
+        self._http_calls = 0
+        self.trace = MenuTrace(self.trace_size)
         self.message = message
+        self.manager = manager
         self.ctx = None
         self.interaction = None
         self.ephemeral = False
         self.bot = None
         self._author_id = None
         self._buttons = self.__class__.get_buttons()
+        # the buttons by the key of their emoji, and the buttons mapping it is built from
+        self._button_keys: Dict[Union[int, str], Button] = {}
+        self._button_keys_of: Optional[Mapping[nextcord.PartialEmoji, Button]] = None
         self._lock = asyncio.Lock()
+        # the locks of the named groups of the buttons, the default group being _lock
+        self._locks: Dict[Optional[str], asyncio.Lock] = {None: self._lock}
         self._event = asyncio.Event()
 
     @nextcord.utils.cached_property
@@ -303,6 +357,15 @@ class Menu(metaclass=_MenuMeta):
         buttons = sorted(self._buttons.values(), key=key)
         return {button.emoji: button for button in buttons if button.is_valid(self)}
 
+    def _get_button_keys(self) -> Dict[Union[int, str], Button]:
+        # looking buttons up by the ID or name of their emoji skips hashing
+        # and comparing PartialEmoji objects for every reaction event
+        buttons = self.buttons
+        if self._button_keys_of is not buttons:
+            self._button_keys = {_emoji_key(emoji): button for emoji, button in buttons.items()}
+            self._button_keys_of = buttons
+        return self._button_keys
+
     def add_button(self, button: Button, *, react: bool = False):
         """|maybecoro|
 
@@ -462,7 +525,7 @@ class Menu(metaclass=_MenuMeta):
 
     def _verify_permissions(
         self,
-        ctx: Optional[commands.Context],
+        ctx: Optional["commands.Context"],
         channel: Optional[nextcord.abc.Messageable],
         permissions: Permissions,
     ):
@@ -510,7 +573,7 @@ class Menu(metaclass=_MenuMeta):
         }:
             return False
 
-        return payload.emoji in self.buttons
+        return _emoji_key(payload.emoji) in self._get_button_keys()
 
     async def _internal_loop(self):
         assert self.bot is not None
@@ -554,13 +617,19 @@ class Menu(metaclass=_MenuMeta):
 
         except asyncio.TimeoutError:
             self.__timed_out = True
+            self.trace._record("timeout")
         finally:
             self._event.set()
+            if self.manager is not None:
+                self.manager._unregister(self)
 
             # Cancel any outstanding tasks (if any)
             for task in tasks:
                 task.cancel()
 
+            if _observers:
+                _notify_finish(self, self.__timed_out)
+            self.trace._record("finalize", self.__timed_out)
             try:
                 await self.finalize(self.__timed_out)
             except Exception:
@@ -568,16 +637,34 @@ class Menu(metaclass=_MenuMeta):
             finally:
                 self.__timed_out = False
 
-            # Can't do any requests if the bot is closed
-            if self.bot and self.bot.is_closed():
+            # Can't do any requests if the bot is closed, and hibernated menus
+            # or menus finalized in bulk leave their message to someone else
+            if (self.bot and self.bot.is_closed()) or self._leave_message:
                 return
 
-            if self.message and self.delete_message_after:
-                await self.message.delete()
-            elif getattr(self, "clear_buttons_after", self.clear_reactions_after):
-                await self.clear()
-            elif isinstance(self, ButtonMenu) and getattr(self, "disable_buttons_after", None):
-                await self.disable()
+            await self._finalize_message()
+
+    async def _edit_message(self, **kwargs: Any) -> Any:
+        # edits the message of the menu, through the edit scheduler of the manager if any
+        assert self.message is not None, "No message to edit"
+        self._http_calls += 1
+        scheduler = self.manager.edit_scheduler if self.manager is not None else None
+        if scheduler is None:
+            result = await self.message.edit(**kwargs)
+        else:
+            result = await scheduler.edit(self.message, **kwargs)
+        self.trace._record("edit")
+        return result
+
+    async def _finalize_message(self):
+        # applies delete_message_after and the like once the menu is done
+        if self.message and self.delete_message_after:
+            self._http_calls += 1
+            await self.message.delete()
+        elif getattr(self, "clear_buttons_after", self.clear_reactions_after):
+            await self.clear()
+        elif isinstance(self, ButtonMenu) and getattr(self, "disable_buttons_after", None):
+            await self.disable()
 
     async def update(self, payload: nextcord.RawReactionActionEvent):
         """|coro|
@@ -589,25 +676,64 @@ class Menu(metaclass=_MenuMeta):
         payload: :class:`nextcord.RawReactionActionEvent`
             The reaction event that triggered this update.
         """
-        button = self.buttons[payload.emoji]
+        button = self._get_button_keys()[_emoji_key(payload.emoji)]
+        self.trace._record("reaction", payload.emoji)
         if not self._running:
             return
+        if self.manager is not None:
+            self.manager._touch(self)
 
+        observed = bool(_observers)
+        pressed = time.perf_counter() if observed else 0.0
         try:
-            if button.lock:
-                async with self._lock:
-                    if self._running:
-                        await button(self, payload)
-            else:
-                await button(self, payload)
+            groups = button._lock_groups
+            if not groups:
+                await self._run_button(button, payload, observed)
+                return
+            started = time.perf_counter() if observed else 0.0
+            acquired = []
+            try:
+                for group in groups:
+                    lock = self._get_lock(group)
+                    await lock.acquire()
+                    acquired.append(lock)
+                self.trace._record("lock", button.emoji)
+                if observed:
+                    _notify(self, "lock_wait", started)
+                if self._running:
+                    await self._run_button(button, payload, observed)
+            finally:
+                for lock in reversed(acquired):
+                    lock.release()
         except Exception as exc:
+            self.trace._record("error", exc)
             await self.on_menu_button_error(exc)
+        finally:
+            if observed:
+                _notify(self, "press", pressed)
+
+    async def _run_button(
+        self, button: Button, payload: nextcord.RawReactionActionEvent, observed: bool
+    ):
+        self.trace._record("button", button.emoji)
+        if not observed:
+            await button(self, payload)
+            return
+        started = time.perf_counter()
+        await button(self, payload)
+        _notify(self, "button", started)
+
+    def _get_lock(self, group: Optional[str]) -> asyncio.Lock:
+        lock = self._locks.get(group)
+        if lock is None:
+            lock = self._locks[group] = asyncio.Lock()
+        return lock
 
     async def on_menu_button_error(self, exc: Exception):
         """|coro|
 
         Handles reporting of errors while updating the menu from events.
-        The default behaviour is to log the exception.
+        The default behaviour is to log the exception along with :attr:`trace`.
 
         This may be overriden by subclasses.
 
@@ -618,11 +744,15 @@ class Menu(metaclass=_MenuMeta):
         """
         # some users may wish to take other actions during or beyond logging
         # which would require awaiting, such as stopping an erroring menu.
-        log.exception("Unhandled exception during menu update.", exc_info=exc)
+        log.exception(
+            "Unhandled exception during menu update. Latest events:\n%s",
+            self.trace.format(),
+            exc_info=exc,
+        )
 
     async def start(
         self,
-        ctx: Optional[commands.Context] = None,
+        ctx: Optional["commands.Context"] = None,
         interaction: Optional[nextcord.Interaction] = None,
         *,
         channel: Optional[nextcord.abc.Messageable] = None,
@@ -665,6 +795,9 @@ class Menu(metaclass=_MenuMeta):
             No context or interaction was given or both were given.
         """
 
+        observed = bool(_observers)
+        started = time.perf_counter() if observed else 0.0
+
         # Clear the reaction buttons cache and re-compute if possible.
         try:
             del self.buttons
@@ -695,6 +828,9 @@ class Menu(metaclass=_MenuMeta):
         elif hasattr(channel, "permissions_for"):
             permissions = channel.permissions_for(me)  # type: ignore
         self.__me = nextcord.Object(id=me.id)
+        if self.manager is not None and not await self.manager._admit(self, interaction, channel):
+            return
+        await self._prepare()
         self._verify_permissions(ctx, channel, permissions)
         self._event.clear()
         msg = self.message
@@ -708,6 +844,8 @@ class Menu(metaclass=_MenuMeta):
             self.__tasks.clear()
 
             self._running = True
+            if self.manager is not None:
+                self.manager._register(self, channel)
             self.__tasks.append(self.bot.loop.create_task(self._internal_loop()))
 
             async def add_reactions_task():
@@ -715,13 +853,23 @@ class Menu(metaclass=_MenuMeta):
                     assert isinstance(
                         msg, nextcord.Message
                     ), "Message must be a nextcord.Message to add reactions"
+                    self._http_calls += 1
                     await msg.add_reaction(emoji)
 
             self.__tasks.append(self.bot.loop.create_task(add_reactions_task()))
 
+            self.trace._record("start")
+            if observed:
+                _notify(self, "start", started)
+                _notify_start(self)
             if wait:
                 await self._event.wait()
 
+    async def _prepare(self):
+        # called once the menu is admitted, before its message is sent, so that
+        # menus rejected under load do not load anything
+        pass
+
     async def finalize(self, timed_out: bool):
         """|coro|
 
@@ -737,7 +885,7 @@ class Menu(metaclass=_MenuMeta):
         pass
 
     async def send_initial_message(
-        self, ctx: Optional[commands.Context], channel: Optional[nextcord.abc.Messageable]
+        self, ctx: Optional["commands.Context"], channel: Optional[nextcord.abc.Messageable]
     ) -> Union[nextcord.Message, nextcord.PartialInteractionMessage]:
         """|coro|
 
@@ -809,7 +957,10 @@ class Menu(metaclass=_MenuMeta):
 
     def stop(self):
         """Stops the internal loop."""
+        self.trace._record("stop")
         self._running = False
+        if self.manager is not None:
+            self.manager._unregister(self)
         for task in self.__tasks:
             task.cancel()
         self.__tasks.clear()
@@ -866,6 +1017,59 @@ class ButtonMenu(Menu, nextcord.ui.View):
         self.clear_buttons_after = clear_buttons_after
         self.disable_buttons_after = disable_buttons_after
 
+    async def interaction_check(self, interaction: nextcord.Interaction) -> bool:
+        """|coro|
+
+        A callback that is called when an interaction happens within the menu
+        that checks whether the callbacks of its components should be called.
+
+        The default implementation marks the menu as used in its :attr:`manager`
+        and returns ``True``. Subclasses overriding this should call it.
+
+        Parameters
+        ------------
+        interaction: :class:`nextcord.Interaction`
+            The interaction that occurred.
+
+        Returns
+        ---------
+        :class:`bool`
+            Whether the callbacks of the components should be called.
+        """
+        custom_id = interaction.data.get("custom_id") if interaction.data else None
+        self.trace._record("interaction", custom_id)
+        if self.manager is not None:
+            self.manager._touch(self)
+        return True
+
+    async def on_error(
+        self, error: Exception, item: nextcord.ui.Item, interaction: nextcord.Interaction
+    ):
+        """|coro|
+
+        A callback that is called when the callback of a component or
+        :meth:`interaction_check` raises an error.
+
+        The default implementation logs the exception along with :attr:`trace`.
+
+        Parameters
+        ------------
+        error: :class:`Exception`
+            The exception that was raised.
+        item: :class:`nextcord.ui.Item`
+            The component whose callback failed.
+        interaction: :class:`nextcord.Interaction`
+            The interaction that led to the failure.
+        """
+        self.trace._record("error", error)
+        log.exception(
+            "Unhandled exception in %r of menu %r. Latest events:\n%s",
+            item,
+            self,
+            self.trace.format(),
+            exc_info=error,
+        )
+
     async def _update_view(self):
         """|coro|
         Updates the :class:`nextcord.ui.View` of the menu.
@@ -875,7 +1079,7 @@ class ButtonMenu(Menu, nextcord.ui.View):
             The message is None.
         """
         assert self.message is not None, "No message to update"
-        await self.message.edit(view=self)
+        await self._edit_message(view=self)
 
     async def _set_all_disabled(self, disable: bool):
         """|coro|
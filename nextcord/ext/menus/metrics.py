@@ -0,0 +1,233 @@
+import array
+import asyncio
+import bisect
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence, Type
+
+from .constants import log
+from .instrumentation import MenuObserver
+
+if TYPE_CHECKING:
+    from .menus import Menu
+
+# default bucket bounds, in seconds for latencies
+DEFAULT_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# default bucket bounds of the number of requests made by a menu
+DEFAULT_HTTP_CALLS_BUCKETS = (1, 2, 3, 5, 10, 20, 50, 100)
+
+
+class _Histogram:
+    # A fixed-bucket histogram. Observing a value only updates the
+    # preallocated arrays, it does not create any container.
+
+    __slots__ = ("bounds", "counts", "total")
+
+    def __init__(self, bounds: Sequence[float]):
+        self.bounds = tuple(bounds)
+        # the last bucket counts the values greater than every bound
+        self.counts = array.array("Q", bytes(8 * (len(self.bounds) + 1)))
+        self.total = array.array("d", b"\0" * 8)
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.total[0] += value
+
+    def export(self, name: str, labels: str, lines: List[str]):
+        cumulative = 0
+        for bound, count in zip(self.bounds, self.counts):
+            cumulative += count
+            lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+        cumulative += self.counts[-1]
+        lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {cumulative}')
+        lines.append(f"{name}_sum{{{labels}}} {self.total[0]}")
+        lines.append(f"{name}_count{{{labels}}} {cumulative}")
+
+
+class _MenuClassMetrics:
+    __slots__ = ("press", "render", "http_calls", "counters")
+
+    # indexes of the counters
+    STARTED = 0
+    FINISHED = 1
+    TIMED_OUT = 2
+
+    def __init__(self, latency_buckets: Sequence[float], http_calls_buckets: Sequence[float]):
+        self.press = _Histogram(latency_buckets)
+        self.render = _Histogram(latency_buckets)
+        self.http_calls = _Histogram(http_calls_buckets)
+        self.counters = array.array("Q", bytes(8 * 3))
+
+
+class MenuMetrics(MenuObserver):
+    """A :class:`MenuObserver` keeping histograms and counters of every menu class.
+
+    It is opt-in: menus are only measured once it is installed with
+    :func:`add_observer`, which should be done before menus are started.
+    The metrics are exported in the Prometheus text format by :meth:`export`,
+    or served over HTTP by :meth:`serve`.
+
+    The following metrics are kept, labelled by ``menu``, the name of the class
+    of the menus:
+
+    - ``menus_press_latency_seconds``: a histogram of the time from a button press
+      to the end of its action, which includes editing the message.
+    - ``menus_render_seconds``: a histogram of the duration of :meth:`PageSource.format_page`.
+    - ``menus_http_calls``: a histogram of the number of requests made by each menu
+      session: sending, editing and deleting its message and adding reactions.
+    - ``menus_started_total``: a counter of started menus.
+    - ``menus_timeouts_total``: a counter of menus that timed out.
+    - ``menus_open``: a gauge of running menus.
+
+    Example
+    ---------
+
+    .. code-block:: python3
+
+        metrics = MenuMetrics()
+        add_observer(metrics)
+
+        @bot.event
+        async def on_ready():
+            await metrics.serve(port=9100)
+
+    Parameters
+    ------------
+    latency_buckets: Sequence[:class:`float`]
+        The upper bounds of the buckets of the latency histograms, in seconds.
+    http_calls_buckets: Sequence[:class:`float`]
+        The upper bounds of the buckets of the histogram of requests per session.
+    """
+
+    def __init__(
+        self,
+        *,
+        latency_buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS,
+        http_calls_buckets: Sequence[float] = DEFAULT_HTTP_CALLS_BUCKETS,
+    ):
+        for buckets in (latency_buckets, http_calls_buckets):
+            if list(buckets) != sorted(buckets):
+                raise ValueError("Bucket bounds must be sorted.")
+        self.latency_buckets = tuple(latency_buckets)
+        self.http_calls_buckets = tuple(http_calls_buckets)
+        self._classes: Dict[Type["Menu"], _MenuClassMetrics] = {}
+
+    def _get_class_metrics(self, menu_cls: Type["Menu"]) -> _MenuClassMetrics:
+        metrics = self._classes.get(menu_cls)
+        if metrics is None:
+            metrics = self._classes[menu_cls] = _MenuClassMetrics(
+                self.latency_buckets, self.http_calls_buckets
+            )
+        return metrics
+
+    def on_start(self, menu: "Menu"):
+        self._get_class_metrics(menu.__class__).counters[_MenuClassMetrics.STARTED] += 1
+
+    def on_finish(self, menu: "Menu", timed_out: bool):
+        metrics = self._get_class_metrics(menu.__class__)
+        metrics.counters[_MenuClassMetrics.FINISHED] += 1
+        if timed_out:
+            metrics.counters[_MenuClassMetrics.TIMED_OUT] += 1
+        metrics.http_calls.observe(menu._http_calls)
+
+    def on_phase(
+        self,
+        menu_cls: Type["Menu"],
+        phase: str,
+        duration: float,
+        page: Optional[int],
+        cache_hit: Optional[bool],
+    ):
+        if phase == "press":
+            self._get_class_metrics(menu_cls).press.observe(duration)
+        elif phase == "format_page":
+            self._get_class_metrics(menu_cls).render.observe(duration)
+
+    def export(self) -> str:
+        """Returns the metrics in the Prometheus text exposition format.
+
+        Returns
+        ---------
+        :class:`str`
+            The metrics.
+        """
+        classes = [(self._labels(menu_cls), metrics) for menu_cls, metrics in self._classes.items()]
+        lines: List[str] = []
+
+        for name, kind, help_text, attribute in (
+            (
+                "menus_press_latency_seconds",
+                "histogram",
+                "Time from a button press to the end of its action.",
+                "press",
+            ),
+            ("menus_render_seconds", "histogram", "Duration of format_page.", "render"),
+            ("menus_http_calls", "histogram", "Requests made per menu session.", "http_calls"),
+        ):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, metrics in classes:
+                getattr(metrics, attribute).export(name, labels, lines)
+
+        counters = _MenuClassMetrics
+        lines.append("# HELP menus_started_total Menus started.")
+        lines.append("# TYPE menus_started_total counter")
+        for labels, metrics in classes:
+            lines.append(f"menus_started_total{{{labels}}} {metrics.counters[counters.STARTED]}")
+        lines.append("# HELP menus_timeouts_total Menus that timed out.")
+        lines.append("# TYPE menus_timeouts_total counter")
+        for labels, metrics in classes:
+            lines.append(f"menus_timeouts_total{{{labels}}} {metrics.counters[counters.TIMED_OUT]}")
+        lines.append("# HELP menus_open Menus running.")
+        lines.append("# TYPE menus_open gauge")
+        for labels, metrics in classes:
+            running = metrics.counters[counters.STARTED] - metrics.counters[counters.FINISHED]
+            lines.append(f"menus_open{{{labels}}} {max(running, 0)}")
+
+        return "\n".join(lines) + "\n"
+
+    @staticmethod
+    def _labels(menu_cls: Type["Menu"]) -> str:
+        name = f"{menu_cls.__module__}.{menu_cls.__qualname__}"
+        name = name.replace("\\", "\\\\").replace('"', '\\"')
+        return f'menu="{name}"'
+
+    async def serve(self, host: str = "127.0.0.1", port: int = 9100) -> asyncio.AbstractServer:
+        """|coro|
+
+        Serves the metrics over HTTP, answering every request with :meth:`export`.
+
+        This is a minimal server meant for a local Prometheus scraper,
+        it only listens on the loopback interface by default.
+
+        Parameters
+        ------------
+        host: :class:`str`
+            The host to listen on. Defaults to ``127.0.0.1``.
+        port: :class:`int`
+            The port to listen on. Defaults to ``9100``.
+
+        Returns
+        ---------
+        :class:`asyncio.AbstractServer`
+            The server, which can be closed with its ``close`` method.
+        """
+        return await asyncio.start_server(self._handle_request, host, port)
+
+    async def _handle_request(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            # the request itself does not matter, only read its headers
+            while (await reader.readline()).strip():
+                pass
+            body = self.export().encode()
+            writer.write(
+                b"HTTP/1.1 200 OK\r\n"
+                b"Content-Type: text/plain; version=0.0.4; charset=utf-8\r\n"
+                b"Content-Length: %d\r\nConnection: close\r\n\r\n" % len(body) + body
+            )
+            await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except Exception:
+            log.exception("Failed to serve the menu metrics.")
+        finally:
+            writer.close()
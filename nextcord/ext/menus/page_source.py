@@ -1,19 +1,36 @@
+import array
+import asyncio
+import bisect
 import inspect
 import itertools
+import mmap
+import os
+import re
+import weakref
+from collections import OrderedDict
+from concurrent.futures import Executor
 from typing import (
     Any,
     AsyncIterator,
+    Awaitable,
     Callable,
+    Dict,
     Generic,
     List,
+    Mapping,
     NamedTuple,
     Optional,
+    OrderedDict as OrderedDictT,
     Sequence,
+    Set,
+    Tuple,
     TypeVar,
     Union,
 )
 
-from .constants import PageFormatType
+import nextcord
+
+from .constants import MESSAGE_CONTENT_LIMIT, PageFormatType, log
 from .menus import Menu
 
 DataType = TypeVar("DataType")
@@ -84,6 +101,15 @@ class PageSource:
         """
         return None
 
+    def _is_cached(self, page_number: int) -> Optional[bool]:
+        # whether get_page can return the page without fetching anything,
+        # or None for sources that do not cache pages
+        return None
+
+    def _get_format_page(self) -> Callable[..., Any]:
+        # the format_page called by the menus, which may be marked with cpu_bound
+        return self.format_page
+
     async def get_page(self, page_number: int) -> Any:
         """|coro|
 
@@ -148,6 +174,44 @@ class PageSource:
         raise NotImplementedError
 
 
+def cpu_bound(executor: Optional[Executor] = None):
+    """Denotes a :meth:`PageSource.format_page` implementation to be CPU-bound.
+
+    The menu will run it in an executor instead of on the event loop, so that
+    formatting expensive pages such as large tables or charts does not stall
+    every other menu. The decorated method must be a regular function, not a
+    coroutine, and must be safe to run in another thread.
+
+    The time each render spent queued in the executor and running is stored in
+    :attr:`MenuPages.last_format_timings` and logged at the debug level.
+
+    Example
+    ---------
+
+    .. code-block:: python3
+
+        class ChartSource(ListPageSource):
+            @cpu_bound()
+            def format_page(self, menu, entries):
+                return {"file": render_chart(entries)}
+
+    Parameters
+    ------------
+    executor: Optional[:class:`concurrent.futures.Executor`]
+        The executor to run the method in. Defaults to ``None``, which uses the
+        default executor of the event loop.
+    """
+
+    def decorator(func: Callable) -> Callable:
+        if inspect.iscoroutinefunction(func):
+            raise TypeError("cpu_bound function must not be a coroutine not %r" % func)
+        func.__menu_cpu_bound__ = True
+        func.__menu_executor__ = executor
+        return func
+
+    return decorator
+
+
 class ListPageSource(PageSource, Generic[DataType]):
     """A data source for a sequence of items.
 
@@ -327,6 +391,126 @@ class GroupByPageSource(ListPageSource, Generic[DataType]):
         raise NotImplementedError
 
 
+class SortablePageSource(ListPageSource, Generic[DataType]):
+    """A data source for a sequence of items that can be shown in several orders.
+
+    This inherits from :class:`ListPageSource`.
+
+    The entries are stored once. For every order, a permutation of the entry
+    positions is computed with :func:`sorted` the first time the order is used,
+    and cached in an :class:`array.array` taking 4 bytes per entry. Switching
+    between orders, including reversed ones, afterwards does not copy or sort
+    anything. Use :meth:`MenuPages.sort_by` to switch the order of an open menu.
+
+    This page source does not handle any sort of formatting, leaving it up
+    to the user. To do so, implement the :meth:`format_page` method.
+
+    Parameters
+    ------------
+    entries: Sequence[Any]
+        The sequence of items to paginate.
+    keys: Mapping[:class:`str`, Callable[[Any], Any]]
+        The key functions of the orders by name, as passed to :func:`sorted`.
+    per_page: :class:`int`
+        How many elements to have per page.
+    order: Optional[:class:`str`]
+        The name of the initial order. Defaults to ``None``,
+        which shows the entries in their original order.
+    reverse: :class:`bool`
+        Whether the initial order is reversed.
+
+    Attributes
+    ------------
+    entries: Sequence[Any]
+        The sequence of items to paginate.
+    per_page: :class:`int`
+        How many elements are in a page.
+    keys: Mapping[:class:`str`, Callable[[Any], Any]]
+        The key functions of the orders by name.
+    order: Optional[:class:`str`]
+        The name of the current order or ``None`` for the original order.
+    reverse: :class:`bool`
+        Whether the current order is reversed.
+    """
+
+    def __init__(
+        self,
+        entries: Sequence[DataType],
+        *,
+        keys: Mapping[str, Callable[[DataType], Any]],
+        per_page: int,
+        order: Optional[str] = None,
+        reverse: bool = False,
+    ):
+        super().__init__(entries, per_page=per_page)
+        self.keys = keys
+        self.order: Optional[str] = None
+        self.reverse = False
+        self._permutations: Dict[str, array.array] = {}
+        self._permutation: Optional[array.array] = None
+        self.sort_by(order, reverse=reverse)
+
+    def sort_by(self, order: Optional[str], *, reverse: bool = False):
+        """Changes the order of the entries.
+
+        The menu has to show a page again for the change to be visible,
+        :meth:`MenuPages.sort_by` takes care of that.
+
+        Parameters
+        ------------
+        order: Optional[:class:`str`]
+            The name of the order in :attr:`keys` or ``None`` for the original order.
+        reverse: :class:`bool`
+            Whether to reverse the order.
+
+        Raises
+        --------
+        KeyError
+            There is no order with that name.
+        """
+        if order is None:
+            self._permutation = None
+        else:
+            permutation = self._permutations.get(order)
+            if permutation is None:
+                key = self.keys[order]
+                entries = self.entries
+                permutation = array.array(
+                    "I", sorted(range(len(entries)), key=lambda i: key(entries[i]))
+                )
+                self._permutations[order] = permutation
+            self._permutation = permutation
+        self.order = order
+        self.reverse = reverse
+
+    def _position(self, index: int) -> int:
+        if self.reverse:
+            index = len(self.entries) - 1 - index
+        return index if self._permutation is None else self._permutation[index]
+
+    async def get_page(self, page_number: int) -> Union[DataType, List[DataType]]:
+        """Returns either a single element of the sequence or
+        a list of elements of the sequence, in the current order.
+
+        If :attr:`per_page` is set to ``1`` then this returns a single
+        element. Otherwise it returns at most :attr:`per_page` elements.
+
+        Returns
+        ---------
+        Union[Any, List[Any]]
+            The data returned.
+        """
+        if page_number < 0:
+            raise IndexError("Negative page number.")
+        entries = self.entries
+        base = page_number * self.per_page
+        stop = min(base + self.per_page, len(entries))
+        page = [entries[self._position(index)] for index in range(base, stop)]
+        if self.per_page == 1:
+            return page[0]
+        return page
+
+
 def _aiter(obj, *, _isasync=inspect.iscoroutinefunction):
     cls = obj.__class__
     try:
@@ -346,12 +530,27 @@ class AsyncIteratorPageSource(PageSource, Generic[DataType]):
     This page source does not handle any sort of formatting, leaving it up
     to the user. To do so, implement the :meth:`format_page` method.
 
+    Since the length of an asynchronous iterator is not known up front,
+    :meth:`get_max_pages` returns ``None`` until the total number of items
+    is known. It becomes known once the iterator is exhausted, once the
+    ``count`` coroutine has returned, or once the background exhaustion
+    requested with ``exhaust_in_background`` has finished. Neither of the
+    latter two block the initial render of the menu.
+
     Parameters
     ------------
     iterator: AsyncIterator[Any]
         The asynchronous iterator to paginate.
     per_page: :class:`int`
         How many elements to have per page.
+    count: Optional[Callable[[], Awaitable[:class:`int`]]]
+        An optional coroutine function returning the total number of
+        items the iterator will yield. It is scheduled in the background
+        when the source is prepared.
+    exhaust_in_background: :class:`bool`
+        Whether to exhaust the iterator in a background task after the
+        source is prepared so that the total number of items becomes known.
+        This caches every item of the iterator. Defaults to ``False``.
 
     Attributes
     ------------
@@ -361,41 +560,123 @@ class AsyncIteratorPageSource(PageSource, Generic[DataType]):
         How many elements are in a page.
     """
 
-    def __init__(self, iterator: AsyncIterator[DataType], *, per_page: int):
+    def __init__(
+        self,
+        iterator: AsyncIterator[DataType],
+        *,
+        per_page: int,
+        count: Optional[Callable[[], Awaitable[int]]] = None,
+        exhaust_in_background: bool = False,
+    ):
         self.iterator = _aiter(iterator)
         self.per_page = per_page
         self._exhausted = False
         self._cache: List[DataType] = []
-
-    async def _iterate(self, n: int):
+        self._count = count
+        self._exhaust_in_background = exhaust_in_background
+        self._total: Optional[int] = None
+        self._total_task: Optional[asyncio.Future] = None
+        self._pull_target = 0
+        self._pull_task: Optional[asyncio.Future] = None
+
+    async def _fill(self, size: int):
+        # Make sure the cache holds at least `size` items.
+        # Only a single task ever advances the iterator. Concurrent requests raise the
+        # target of the in-flight pull and wait on it instead of calling __anext__ themselves.
+        while not self._exhausted and len(self._cache) < size:
+            if size > self._pull_target:
+                self._pull_target = size
+            task = self._pull_task
+            if task is None or task.done():
+                task = self._pull_task = asyncio.ensure_future(self._pull())
+            # A cancelled waiter must not cancel the pull shared with the other waiters
+            await asyncio.shield(task)
+
+    async def _pull(self):
         it = self.iterator
         cache = self._cache
-        for _ in range(0, n):
+        # The target is re-read on every item as waiters may raise it in the meantime
+        while not self._exhausted and len(cache) < self._pull_target:
             try:
                 elem = await it.__anext__()
             except StopAsyncIteration:
                 self._exhausted = True
-                break
+                self._total = len(cache)
             else:
                 cache.append(elem)
 
+    async def _iterate(self, n: int):
+        await self._fill(len(self._cache) + n)
+
+    async def _resolve_total(self):
+        try:
+            if self._count is not None:
+                total = await self._count()
+                # The iterator may have been exhausted in the meantime, which is authoritative
+                if self._total is None:
+                    self._total = total
+            else:
+                while not self._exhausted:
+                    await self._fill(len(self._cache) + self.per_page)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            log.exception("Failed to resolve the total number of items of %r.", self)
+
     async def prepare(self, *, _aiter=_aiter):
         # Iterate until we have at least a bit more single page
         await self._iterate(self.per_page + 1)
+        if self._total is None and (self._count is not None or self._exhaust_in_background):
+            self._total_task = asyncio.ensure_future(self._resolve_total())
+
+    async def wait_for_max_pages(self) -> Optional[int]:
+        """|coro|
+
+        Waits until the total number of items is known and
+        returns the result of :meth:`get_max_pages`.
+
+        If neither ``count`` nor ``exhaust_in_background`` were given
+        then this returns immediately.
+
+        Returns
+        --------
+        Optional[:class:`int`]
+            The maximum number of pages, if it could be determined.
+        """
+        if self._total_task is not None:
+            await asyncio.shield(self._total_task)
+        return self.get_max_pages()
 
     def is_paginating(self) -> bool:
         """:class:`bool`: Whether pagination is required."""
+        if self._total is not None:
+            return self._total > self.per_page
         # If we have not prepared yet, we do not know if we are paginating, so we return True
         # This is to ensure that the buttons will be created in the case we are paginating
         # If we have prepared, but we are exhausted before 1 page, we are not paginating
         return not self._cache or len(self._cache) > self.per_page
 
+    def get_max_pages(self) -> Optional[int]:
+        """Optional[:class:`int`]: The maximum number of pages required to paginate
+        the iterator, or ``None`` if the total number of items is not known yet."""
+        if self._total is None:
+            return None
+        pages, left_over = divmod(self._total, self.per_page)
+        if left_over:
+            pages += 1
+        return pages
+
+    def _is_cached(self, page_number: int) -> Optional[bool]:
+        if self.per_page == 1:
+            return self._exhausted or len(self._cache) > page_number
+        return self._exhausted or len(self._cache) > (page_number + 1) * self.per_page
+
     async def _get_single_page(self, page_number: int) -> DataType:
         if page_number < 0:
             raise IndexError("Negative page number.")
 
         if not self._exhausted and len(self._cache) <= page_number:
-            await self._iterate((page_number + 1) - len(self._cache))
+            await self._fill(page_number + 1)
         return self._cache[page_number]
 
     async def _get_page_range(self, page_number: int) -> List[DataType]:
@@ -405,7 +686,7 @@ class AsyncIteratorPageSource(PageSource, Generic[DataType]):
         base = page_number * self.per_page
         max_base = base + self.per_page
         if not self._exhausted and len(self._cache) <= max_base:
-            await self._iterate((max_base + 1) - len(self._cache))
+            await self._fill(max_base + 1)
 
         entries = self._cache[base:max_base]
         if not entries and max_base > len(self._cache):
@@ -451,3 +732,1121 @@ class AsyncIteratorPageSource(PageSource, Generic[DataType]):
             See :meth:`PageSource.format_page`.
         """
         raise NotImplementedError
+
+
+CursorType = TypeVar("CursorType")
+
+KeysetFetchType = Callable[[Optional[CursorType], int], Awaitable[Sequence[DataType]]]
+
+
+class KeysetPageSource(PageSource, Generic[DataType, CursorType]):
+    """A data source for data fetched with keyset (cursor) pagination.
+
+    Instead of an offset, each page is requested with the cursor of the last
+    entry of the previous page, e.g. ``WHERE id > $1 ORDER BY id LIMIT $2``.
+    The cursors at the boundaries of visited pages are recorded, so moving
+    forward or backward by one page costs a single query regardless of how
+    deep into the result set the page is.
+
+    Jumping to a page that has not been visited yet walks forward from the
+    furthest known page, one query per page.
+
+    :meth:`get_max_pages` returns ``None`` until the end of the result set has
+    been reached.
+
+    This page source does not handle any sort of formatting, leaving it up
+    to the user. To do so, implement the :meth:`format_page` method.
+
+    Parameters
+    ------------
+    fetch: Callable[[Optional[Any], :class:`int`], Awaitable[Sequence[Any]]]
+        A coroutine function taking the cursor to fetch after and a limit
+        and returning at most that many entries ordered by cursor.
+        The cursor is ``None`` for the first page.
+    key: Callable[[Any], Any]
+        A function returning the cursor of an entry.
+    per_page: :class:`int`
+        How many elements to have per page.
+
+    Attributes
+    ------------
+    per_page: :class:`int`
+        How many elements are in a page.
+    """
+
+    def __init__(
+        self,
+        fetch: KeysetFetchType,
+        *,
+        key: Callable[[DataType], CursorType],
+        per_page: int,
+    ):
+        self.fetch = fetch
+        self.key = key
+        self.per_page = per_page
+        # the cursor to fetch after for each visited page, page 0 starts at the beginning
+        self._cursors: List[Optional[CursorType]] = [None]
+        self._max_pages: Optional[int] = None
+        self._last_page: Optional[Tuple[int, List[DataType]]] = None
+        # concurrent requests wait for each other instead of running the same
+        # queries and racing on the recorded cursors
+        self._lock = asyncio.Lock()
+
+    async def _fetch_page(self, page_number: int) -> List[DataType]:
+        # one extra entry is requested to know whether there is a next page
+        entries = list(await self.fetch(self._cursors[page_number], self.per_page + 1))
+        has_next = len(entries) > self.per_page
+        entries = entries[: self.per_page]
+
+        if not entries and page_number > 0:
+            # the previous page was the last one after all
+            self._max_pages = page_number
+            del self._cursors[page_number:]
+            raise IndexError("Went too far")
+
+        if not entries:
+            # there are no entries at all, but the menu still shows an empty first page
+            self._max_pages = 0
+            self._last_page = (0, entries)
+            return entries
+
+        if has_next:
+            if len(self._cursors) == page_number + 1:
+                self._cursors.append(self.key(entries[-1]))
+            else:
+                # the data may have changed since the boundary was recorded
+                self._cursors[page_number + 1] = self.key(entries[-1])
+        else:
+            self._max_pages = page_number + 1
+            del self._cursors[page_number + 1 :]
+
+        self._last_page = (page_number, entries)
+        return entries
+
+    async def prepare(self):
+        await self._fetch_page(0)
+
+    def is_paginating(self) -> bool:
+        """:class:`bool`: Whether pagination is required."""
+        # Before preparing we do not know, so assume we are paginating
+        return self._max_pages is None or self._max_pages > 1
+
+    def get_max_pages(self) -> Optional[int]:
+        """Optional[:class:`int`]: The maximum number of pages required to paginate
+        the result set, or ``None`` if the end has not been reached yet."""
+        return self._max_pages
+
+    def _is_cached(self, page_number: int) -> Optional[bool]:
+        return self._last_page is not None and self._last_page[0] == page_number
+
+    async def _get_page_entries(self, page_number: int) -> List[DataType]:
+        if page_number < 0:
+            raise IndexError("Negative page number.")
+
+        async with self._lock:
+            if self._max_pages is not None and page_number >= max(self._max_pages, 1):
+                raise IndexError("Went too far")
+
+            if self._last_page is not None and self._last_page[0] == page_number:
+                return self._last_page[1]
+
+            # walk forward from the furthest page with a known boundary
+            while len(self._cursors) <= page_number:
+                await self._fetch_page(len(self._cursors) - 1)
+                if self._max_pages is not None and page_number >= self._max_pages:
+                    raise IndexError("Went too far")
+
+            return await self._fetch_page(page_number)
+
+    async def get_page(self, page_number: int) -> Union[DataType, List[DataType]]:
+        """Returns either a single element of the result set or
+        a page of the result set.
+
+        If :attr:`per_page` is set to ``1`` then this returns a single
+        element. Otherwise it returns at most :attr:`per_page` elements.
+
+        If there are no entries, the first page is an empty list,
+        or ``None`` if :attr:`per_page` is set to ``1``.
+
+        Returns
+        ---------
+        Union[Any, List[Any]]
+            The data returned.
+        """
+        entries = await self._get_page_entries(page_number)
+        if self.per_page == 1:
+            return entries[0] if entries else None
+        return entries
+
+    async def format_page(
+        self, menu: Menu, page: Union[DataType, List[DataType]]
+    ) -> PageFormatType:
+        """An abstract method to format the page.
+
+        This works similar to the :meth:`PageSource.format_page` except
+        the type of the ``page`` parameter is documented.
+
+        Parameters
+        ------------
+        menu: :class:`Menu`
+            The menu that wants to format this page.
+        page: Union[Any, List[Any]]
+            The page returned by :meth:`get_page`. This is either a single element
+            if :attr:`per_page` is set to ``1`` or a list of entries otherwise.
+
+        Returns
+        ---------
+        Union[:class:`str`, :class:`nextcord.Embed`, List[:class:`nextcord.Embed`], :class:`dict`]
+            See :meth:`PageSource.format_page`.
+        """
+        raise NotImplementedError
+
+
+OffsetFetchType = Callable[[int, int], Awaitable[Sequence[DataType]]]
+
+
+class OffsetPageSource(PageSource, Generic[DataType]):
+    """A data source for random-access data fetched by offset and limit.
+
+    Entries are fetched in blocks of :attr:`block_size` entries aligned to
+    multiples of the block size, and the most recently used blocks are kept
+    in a cache. Neighbouring pages therefore usually cost no query at all,
+    and missing adjacent blocks needed at the same time are fetched together
+    in a single call to ``fetch``.
+
+    This page source does not handle any sort of formatting, leaving it up
+    to the user. To do so, implement the :meth:`format_page` method.
+
+    Parameters
+    ------------
+    fetch: Callable[[:class:`int`, :class:`int`], Awaitable[Sequence[Any]]]
+        A coroutine function taking an offset and a limit and returning
+        at most that many entries starting at that offset.
+    count: Callable[[], Awaitable[:class:`int`]]
+        A coroutine function returning the total number of entries.
+        It is called once when the source is prepared.
+    per_page: :class:`int`
+        How many elements to have per page.
+    block_size: Optional[:class:`int`]
+        How many entries to fetch at once. This must not be smaller than
+        ``per_page``. Defaults to eight pages worth of entries.
+    max_cached_blocks: :class:`int`
+        The maximum number of blocks to keep in the cache. Defaults to 16.
+
+    Attributes
+    ------------
+    per_page: :class:`int`
+        How many elements are in a page.
+    block_size: :class:`int`
+        How many entries are fetched at once.
+    max_cached_blocks: :class:`int`
+        The maximum number of blocks kept in the cache.
+    """
+
+    def __init__(
+        self,
+        fetch: OffsetFetchType,
+        count: Callable[[], Awaitable[int]],
+        *,
+        per_page: int,
+        block_size: Optional[int] = None,
+        max_cached_blocks: int = 16,
+    ):
+        if block_size is None:
+            block_size = per_page * 8
+        if block_size < per_page:
+            raise ValueError("block_size must not be smaller than per_page.")
+        if max_cached_blocks < 1:
+            raise ValueError("max_cached_blocks must be at least 1.")
+
+        self.fetch = fetch
+        self.count = count
+        self.per_page = per_page
+        self.block_size = block_size
+        self.max_cached_blocks = max_cached_blocks
+        self._total: Optional[int] = None
+        self._blocks: OrderedDictT[int, Sequence[DataType]] = OrderedDict()
+        self._pending: Dict[int, asyncio.Future] = {}
+        # the number of get_page calls waiting for each fetch
+        self._waiters: Dict[asyncio.Future, int] = {}
+
+    async def prepare(self):
+        self._total = await self.count()
+
+    def cancel(self):
+        """Cancels all fetches that are in progress.
+
+        Pending :meth:`get_page` calls raise :exc:`asyncio.CancelledError`.
+        A fetch is also cancelled on its own once every :meth:`get_page` call
+        waiting for it has been cancelled, e.g. because their menus stopped,
+        so this is only needed to abort the fetches of every menu at once.
+        """
+        for future in set(self._pending.values()):
+            future.cancel()
+        self._pending.clear()
+
+    def is_paginating(self) -> bool:
+        """:class:`bool`: Whether pagination is required."""
+        # Before preparing we do not know, so assume we are paginating
+        return self._total is None or self._total > self.per_page
+
+    def get_max_pages(self) -> Optional[int]:
+        """Optional[:class:`int`]: The maximum number of pages required to paginate
+        the entries, or ``None`` if the source has not been prepared yet."""
+        if self._total is None:
+            return None
+        pages, left_over = divmod(self._total, self.per_page)
+        if left_over:
+            pages += 1
+        return pages
+
+    def _cache_block(self, index: int, block: Sequence[DataType]):
+        self._blocks[index] = block
+        self._blocks.move_to_end(index)
+        while len(self._blocks) > self.max_cached_blocks:
+            self._blocks.popitem(last=False)
+
+    async def _fetch_blocks(self, start: int, stop: int) -> Dict[int, Sequence[DataType]]:
+        # fetch the contiguous blocks [start, stop) with a single query
+        size = self.block_size
+        try:
+            entries = await self.fetch(start * size, (stop - start) * size)
+            blocks = {}
+            for index in range(start, stop):
+                offset = (index - start) * size
+                blocks[index] = entries[offset : offset + size]
+                self._cache_block(index, blocks[index])
+            return blocks
+        finally:
+            for index in range(start, stop):
+                self._pending.pop(index, None)
+
+    async def _get_blocks(self, start: int, stop: int) -> List[Sequence[DataType]]:
+        # blocks are collected up front as they may be evicted while waiting for others
+        blocks: Dict[int, Sequence[DataType]] = {}
+        run_start = None
+        for index in range(start, stop + 1):
+            if index < stop and index in self._blocks:
+                self._blocks.move_to_end(index)
+                blocks[index] = self._blocks[index]
+            missing = index < stop and index not in blocks and index not in self._pending
+            if missing and run_start is None:
+                run_start = index
+            elif not missing and run_start is not None:
+                # coalesce adjacent missing blocks into one fetch
+                future = asyncio.ensure_future(self._fetch_blocks(run_start, index))
+                for pending in range(run_start, index):
+                    self._pending[pending] = future
+                run_start = None
+
+        waiting = {self._pending[index] for index in range(start, stop) if index not in blocks}
+        if waiting:
+            for future in waiting:
+                self._waiters[future] = self._waiters.get(future, 0) + 1
+            try:
+                # A cancelled waiter must not cancel a fetch shared with other waiters
+                for fetched in await asyncio.gather(*map(asyncio.shield, waiting)):
+                    blocks.update(fetched)
+            finally:
+                for future in waiting:
+                    self._waiters[future] -= 1
+                    if not self._waiters[future]:
+                        del self._waiters[future]
+                        # nobody needs the blocks anymore
+                        future.cancel()
+
+        return [blocks[index] for index in range(start, stop)]
+
+    def _is_cached(self, page_number: int) -> Optional[bool]:
+        base = page_number * self.per_page
+        first_block = base // self.block_size
+        last_block = (base + self.per_page - 1) // self.block_size
+        return all(index in self._blocks for index in range(first_block, last_block + 1))
+
+    async def _get_page_entries(self, page_number: int) -> List[DataType]:
+        if page_number < 0:
+            raise IndexError("Negative page number.")
+        if page_number == 0 and self._total == 0:
+            # there is nothing to fetch, but the menu still shows an empty first page
+            return []
+        max_pages = self.get_max_pages()
+        if max_pages is not None and page_number >= max_pages:
+            raise IndexError("Went too far")
+
+        base = page_number * self.per_page
+        end = base + self.per_page
+        if self._total is not None:
+            end = min(end, self._total)
+        first_block = base // self.block_size
+        blocks = await self._get_blocks(first_block, (end - 1) // self.block_size + 1)
+
+        offset = base - first_block * self.block_size
+        entries = list(itertools.chain.from_iterable(blocks))[offset : offset + end - base]
+        if not entries:
+            raise IndexError("Went too far")
+        return entries
+
+    async def get_page(self, page_number: int) -> Union[DataType, List[DataType]]:
+        """Returns either a single element of the entries or
+        a page of the entries.
+
+        If :attr:`per_page` is set to ``1`` then this returns a single
+        element. Otherwise it returns at most :attr:`per_page` elements.
+
+        If there are no entries, the first page is an empty list,
+        or ``None`` if :attr:`per_page` is set to ``1``.
+
+        Returns
+        ---------
+        Union[Any, List[Any]]
+            The data returned.
+        """
+        entries = await self._get_page_entries(page_number)
+        if self.per_page == 1:
+            return entries[0] if entries else None
+        return entries
+
+    async def format_page(
+        self, menu: Menu, page: Union[DataType, List[DataType]]
+    ) -> PageFormatType:
+        """An abstract method to format the page.
+
+        This works similar to the :meth:`PageSource.format_page` except
+        the type of the ``page`` parameter is documented.
+
+        Parameters
+        ------------
+        menu: :class:`Menu`
+            The menu that wants to format this page.
+        page: Union[Any, List[Any]]
+            The page returned by :meth:`get_page`. This is either a single element
+            if :attr:`per_page` is set to ``1`` or a list of entries otherwise.
+
+        Returns
+        ---------
+        Union[:class:`str`, :class:`nextcord.Embed`, List[:class:`nextcord.Embed`], :class:`dict`]
+            See :meth:`PageSource.format_page`.
+        """
+        raise NotImplementedError
+
+
+class LineIndex:
+    """A compact index of the line offsets of a file used by :class:`FilePageSource`.
+
+    The index stores the byte offset at which each line starts in an
+    :class:`array.array` of unsigned 64-bit integers, so it takes 8 bytes per
+    line, and keeps the file memory-mapped for reading lines in constant time.
+
+    Indexes are built with :meth:`build` in a single streaming pass over the file.
+    An index reflects the file at the time it was built. Appended lines are not
+    visible until a new index is built, and the file must not be truncated while
+    it is in use.
+
+    Attributes
+    ------------
+    path: :class:`str`
+        The absolute path of the indexed file.
+    size: :class:`int`
+        The size of the file in bytes when it was indexed.
+    mtime_ns: :class:`int`
+        The modification time of the file in nanoseconds when it was indexed.
+    """
+
+    __slots__ = ("path", "size", "mtime_ns", "_offsets", "_mmap", "__weakref__")
+
+    # indexes shared between all sources that are alive, keyed by path and file version
+    _shared: "weakref.WeakValueDictionary[Tuple[str, int, int], LineIndex]" = (
+        weakref.WeakValueDictionary()
+    )
+
+    def __init__(self, path: str, *, chunk_size: int = 1 << 20):
+        self.path = os.path.abspath(path)
+        with open(self.path, "rb") as fp:
+            stat = os.fstat(fp.fileno())
+            self.mtime_ns = stat.st_mtime_ns
+
+            offsets = array.array("Q", [0])
+            position = 0
+            # only index up to the size at the time of indexing as the file may grow
+            while position < stat.st_size:
+                chunk = fp.read(min(chunk_size, stat.st_size - position))
+                if not chunk:
+                    break
+                end = chunk.find(b"\n")
+                while end != -1:
+                    offsets.append(position + end + 1)
+                    end = chunk.find(b"\n", end + 1)
+                position += len(chunk)
+            # a last line without a trailing newline
+            if offsets[-1] != position:
+                offsets.append(position)
+
+            self.size = position
+            self._offsets = offsets
+            # an empty file cannot be memory-mapped, but it has no lines to read either
+            self._mmap = (
+                mmap.mmap(fp.fileno(), position, access=mmap.ACCESS_READ) if position else None
+            )
+
+    @classmethod
+    def build(cls, path: str) -> "LineIndex":
+        """Returns the index of the file at ``path``, building it if needed.
+
+        An index that is still in use by another source is reused if the
+        file has not changed since it was built.
+
+        This does blocking file I/O, consider running it in an executor.
+
+        Parameters
+        ------------
+        path: :class:`str`
+            The path of the file to index.
+
+        Returns
+        --------
+        :class:`LineIndex`
+            The index of the file.
+        """
+        path = os.path.abspath(path)
+        stat = os.stat(path)
+        key = (path, stat.st_size, stat.st_mtime_ns)
+        index = cls._shared.get(key)
+        if index is None:
+            index = cls(path)
+            cls._shared[(index.path, index.size, index.mtime_ns)] = index
+        return index
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def is_stale(self) -> bool:
+        """:class:`bool`: Whether the file has changed since it was indexed."""
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return True
+        return stat.st_size != self.size or stat.st_mtime_ns != self.mtime_ns
+
+    def get_lines(self, start: int, stop: int) -> List[bytes]:
+        """Returns the lines in the range [start, stop) without their line endings.
+
+        Parameters
+        ------------
+        start: :class:`int`
+            The index of the first line.
+        stop: :class:`int`
+            The index after the last line.
+
+        Returns
+        --------
+        List[:class:`bytes`]
+            The raw lines.
+        """
+        offsets = self._offsets
+        stop = min(stop, len(offsets) - 1)
+        if self._mmap is None or start >= stop:
+            return []
+        data = self._mmap[offsets[start] : offsets[stop]]
+        if data.endswith(b"\n"):
+            data = data[:-1]
+        return [line[:-1] if line.endswith(b"\r") else line for line in data.split(b"\n")]
+
+
+class FilePageSource(PageSource):
+    """A data source for the lines of a file, which can be much larger than memory.
+
+    The file is indexed once with a :class:`LineIndex` when the source is prepared,
+    which happens in an executor so the event loop is not blocked, and pages are then
+    read straight from the memory-mapped file. The index only takes 8 bytes per line and
+    is shared with other sources on the same unchanged file.
+
+    This page source does not handle any sort of formatting, leaving it up
+    to the user. To do so, implement the :meth:`format_page` method.
+
+    Parameters
+    ------------
+    path: :class:`str`
+        The path of the file to paginate.
+    per_page: :class:`int`
+        How many lines to have per page.
+    encoding: :class:`str`
+        The encoding used to decode the lines. Defaults to ``utf-8``.
+    errors: :class:`str`
+        How decoding errors are handled, see :meth:`bytes.decode`.
+        Defaults to ``replace``.
+    index: Optional[:class:`LineIndex`]
+        A pre-built index of the file. If not given then one is built or
+        reused from another source when the source is prepared.
+
+    Attributes
+    ------------
+    path: :class:`str`
+        The path of the file to paginate.
+    per_page: :class:`int`
+        How many lines are in a page.
+    index: Optional[:class:`LineIndex`]
+        The index of the file or ``None`` if it has not been prepared yet.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        *,
+        per_page: int,
+        encoding: str = "utf-8",
+        errors: str = "replace",
+        index: Optional[LineIndex] = None,
+    ):
+        self.path = path
+        self.per_page = per_page
+        self.encoding = encoding
+        self.errors = errors
+        self.index = index
+
+    async def prepare(self):
+        if self.index is None:
+            loop = asyncio.get_running_loop()
+            self.index = await loop.run_in_executor(None, LineIndex.build, self.path)
+
+    def is_paginating(self) -> bool:
+        """:class:`bool`: Whether pagination is required."""
+        # Before preparing we do not know, so assume we are paginating
+        return self.index is None or len(self.index) > self.per_page
+
+    def get_max_pages(self) -> Optional[int]:
+        """Optional[:class:`int`]: The maximum number of pages required to paginate
+        the file, or ``None`` if the source has not been prepared yet."""
+        if self.index is None:
+            return None
+        pages, left_over = divmod(len(self.index), self.per_page)
+        if left_over:
+            pages += 1
+        return pages
+
+    async def get_page(self, page_number: int) -> Union[str, List[str]]:
+        """Returns either a single line of the file or
+        a list of lines of the file.
+
+        If :attr:`per_page` is set to ``1`` then this returns a single
+        line. Otherwise it returns at most :attr:`per_page` lines.
+
+        If the file is empty, the first page is an empty list,
+        or an empty string if :attr:`per_page` is set to ``1``.
+
+        Returns
+        ---------
+        Union[:class:`str`, List[:class:`str`]]
+            The data returned.
+        """
+        if page_number < 0:
+            raise IndexError("Negative page number.")
+        assert self.index is not None, "Cannot get a page before the source is prepared."
+
+        base = page_number * self.per_page
+        lines = self.index.get_lines(base, base + self.per_page)
+        if not lines:
+            if page_number == 0 and not len(self.index):
+                return "" if self.per_page == 1 else []
+            raise IndexError("Went too far")
+
+        decoded = [line.decode(self.encoding, self.errors) for line in lines]
+        if self.per_page == 1:
+            return decoded[0]
+        return decoded
+
+    async def format_page(self, menu: Menu, page: Union[str, List[str]]) -> PageFormatType:
+        """An abstract method to format the page.
+
+        This works similar to the :meth:`PageSource.format_page` except
+        the type of the ``page`` parameter is documented.
+
+        Parameters
+        ------------
+        menu: :class:`Menu`
+            The menu that wants to format this page.
+        page: Union[:class:`str`, List[:class:`str`]]
+            The page returned by :meth:`get_page`. This is either a single line
+            if :attr:`per_page` is set to ``1`` or a list of lines otherwise.
+
+        Returns
+        ---------
+        Union[:class:`str`, :class:`nextcord.Embed`, List[:class:`nextcord.Embed`], :class:`dict`]
+            See :meth:`PageSource.format_page`.
+        """
+        raise NotImplementedError
+
+
+class TextPageSource(PageSource):
+    """A data source for a long text split into pages of a maximum length.
+
+    The page boundaries are computed in a single pass over the text when the
+    source is created and only their offsets are stored, so pages are sliced
+    from the text on demand without copying it.
+
+    Pages are preferably split at line breaks. A line that does not fit on a
+    page by itself is split at the last whitespace that fits, or at the maximum
+    length if there is none. Code blocks that span several pages are closed at the
+    end of a page and reopened, with the same language, at the start of the next
+    one, so that every page renders correctly on its own. The added fences count
+    towards the maximum length, and a block whose opening line is too long to be
+    repeated is reopened without its language.
+
+    This page source does not handle any sort of formatting, leaving it up
+    to the user. To do so, implement the :meth:`format_page` method.
+
+    Parameters
+    ------------
+    text: :class:`str`
+        The text to paginate.
+    max_size: :class:`int`
+        The maximum number of characters of a page. Defaults to ``2000``, the
+        limit of message content. Use ``4096`` when the pages are shown as
+        embed descriptions.
+
+    Attributes
+    ------------
+    text: :class:`str`
+        The text to paginate.
+    max_size: :class:`int`
+        The maximum number of characters of a page.
+    """
+
+    def __init__(self, text: str, *, max_size: int = MESSAGE_CONTENT_LIMIT):
+        if max_size < 16:
+            raise ValueError("max_size must be at least 16.")
+
+        self.text = text
+        self.max_size = max_size
+        # page i is text[_offsets[i]:_offsets[i + 1]] inside the code block opened by _fences[i]
+        self._offsets = array.array("Q", [0])
+        self._fences: List[str] = []
+        self._split()
+
+    def _split(self):
+        text = self.text
+        length = len(text)
+        offsets = self._offsets
+        fences = self._fences
+        # the closing fence and the line break it may need
+        close_size = len("\n```")
+        # the longest opening line that can be repeated on a page with some text,
+        # longer ones are reopened with a plain fence instead
+        max_fence = self.max_size - close_size - 2
+
+        start = position = 0
+        # the opening line of the code block at the start of the page and at the position
+        page_fence = fence = ""
+        while position < length:
+            newline = text.find("\n", position)
+            line_end = length if newline == -1 else newline + 1
+
+            line_fence = fence
+            line = text[position:line_end].strip()
+            # lines such as ```code``` do not open or close a block
+            if line.startswith("```") and line.count("```") == 1:
+                line_fence = "" if fence else line
+
+            open_size = len(page_fence) + 1 if page_fence else 0
+            size = open_size + line_end - start + (close_size if line_fence else 0)
+            if size <= self.max_size:
+                position = line_end
+                fence = line_fence
+                continue
+
+            if position > start:
+                # end the page before this line and try the line again on a new page
+                offsets.append(position)
+                fences.append(page_fence)
+                start = position
+                page_fence = fence if len(fence) <= max_fence else "```"
+                continue
+
+            # the line does not fit on a page of its own
+            budget = self.max_size - open_size - (close_size if fence else 0)
+            end = start + max(budget, 1)
+            space = max(text.rfind(" ", start, end), text.rfind("\t", start, end))
+            if space > start:
+                end = space + 1
+            offsets.append(end)
+            fences.append(page_fence)
+            start = position = end
+            page_fence = fence if len(fence) <= max_fence else "```"
+
+        if start < length or not fences:
+            offsets.append(length)
+            fences.append(page_fence)
+
+    def is_paginating(self) -> bool:
+        """:class:`bool`: Whether pagination is required."""
+        return len(self._fences) > 1
+
+    def get_max_pages(self) -> int:
+        """:class:`int`: The maximum number of pages required to paginate the text."""
+        return len(self._fences)
+
+    async def get_page(self, page_number: int) -> str:
+        """Returns the text of the page, with code block fences
+        added if the page starts or ends inside a code block.
+
+        Returns
+        ---------
+        :class:`str`
+            The text of the page.
+        """
+        if page_number < 0:
+            raise IndexError("Negative page number.")
+        if page_number >= len(self._fences):
+            raise IndexError("Went too far")
+
+        page = self.text[self._offsets[page_number] : self._offsets[page_number + 1]]
+        fence = self._fences[page_number]
+        if fence:
+            page = f"{fence}\n{page}"
+        # the page ends inside a code block if the next one starts inside one
+        if page_number + 1 < len(self._fences) and self._fences[page_number + 1]:
+            page = f"{page}```" if page.endswith("\n") else f"{page}\n```"
+        return page
+
+    async def format_page(self, menu: Menu, page: str) -> PageFormatType:
+        """An abstract method to format the page.
+
+        This works similar to the :meth:`PageSource.format_page` except
+        the type of the ``page`` parameter is documented.
+
+        Parameters
+        ------------
+        menu: :class:`Menu`
+            The menu that wants to format this page.
+        page: :class:`str`
+            The page returned by :meth:`get_page`. This is at most
+            :attr:`max_size` characters long.
+
+        Returns
+        ---------
+        Union[:class:`str`, :class:`nextcord.Embed`, List[:class:`nextcord.Embed`], :class:`dict`]
+            See :meth:`PageSource.format_page`.
+        """
+        raise NotImplementedError
+
+
+class PackedPageSource(PageSource, Generic[DataType]):
+    """A data source for a sequence of items packed into pages by size
+    instead of by a fixed number of items per page.
+
+    Each page holds as many consecutive items as fit in ``max_size``, as
+    measured by ``measure``, so pages of long items do not overflow limits
+    such as the embed description length while pages of short items are not
+    left mostly empty. An item that is larger than ``max_size`` by itself gets
+    a page of its own.
+
+    The page boundaries are computed once, when the source is created, by
+    binary searching a prefix sum of the item sizes, which takes linear time
+    for the prefix sum and logarithmic time per page. Getting a page is then a
+    lookup of its boundaries and :meth:`find_page` is a binary search.
+
+    This page source does not handle any sort of formatting, leaving it up
+    to the user. To do so, implement the :meth:`format_page` method.
+
+    Parameters
+    ------------
+    entries: Sequence[Any]
+        The sequence of items to paginate.
+    max_size: :class:`int`
+        The maximum total size of the items of a page.
+    measure: Callable[[Any], :class:`int`]
+        A function returning the size of an item. Defaults to the length of
+        the item converted to a :class:`str`.
+    separator_size: :class:`int`
+        The size added between two consecutive items of a page, such as
+        ``1`` for items joined with line breaks. Defaults to ``0``.
+    max_per_page: Optional[:class:`int`]
+        The maximum number of items of a page regardless of their size,
+        such as ``25`` for embed fields.
+
+    Attributes
+    ------------
+    entries: Sequence[Any]
+        The sequence of items to paginate.
+    max_size: :class:`int`
+        The maximum total size of the items of a page.
+    """
+
+    def __init__(
+        self,
+        entries: Sequence[DataType],
+        *,
+        max_size: int,
+        measure: Optional[Callable[[DataType], int]] = None,
+        separator_size: int = 0,
+        max_per_page: Optional[int] = None,
+    ):
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1.")
+        if max_per_page is not None and max_per_page < 1:
+            raise ValueError("max_per_page must be at least 1.")
+
+        self.entries = entries
+        self.max_size = max_size
+        # page i holds entries[_boundaries[i]:_boundaries[i + 1]]
+        self._boundaries = array.array("Q", [0])
+
+        if measure is None:
+            measure = lambda entry: len(str(entry))
+
+        # Counting the separator after every item lets a page of items i to j fit
+        # when prefix[j] - prefix[i] <= max_size + separator_size.
+        prefix = array.array("Q", [0])
+        prefix.extend(itertools.accumulate(measure(entry) + separator_size for entry in entries))
+
+        count = len(entries)
+        budget = max_size + separator_size
+        start = 0
+        while start < count:
+            end = bisect.bisect_right(prefix, prefix[start] + budget, start + 1) - 1
+            # an item larger than a page gets a page of its own
+            end = max(end, start + 1)
+            if max_per_page is not None:
+                end = min(end, start + max_per_page)
+            self._boundaries.append(end)
+            start = end
+
+        # an empty sequence still has an empty first page
+        if not count:
+            self._boundaries.append(0)
+
+    def is_paginating(self) -> bool:
+        """:class:`bool`: Whether pagination is required."""
+        return len(self._boundaries) > 2
+
+    def get_max_pages(self) -> int:
+        """:class:`int`: The maximum number of pages required to paginate this sequence."""
+        return len(self._boundaries) - 1
+
+    def find_page(self, index: int) -> int:
+        """Returns the number of the page an item is on.
+
+        Parameters
+        ------------
+        index: :class:`int`
+            The index of the item in :attr:`entries`.
+
+        Returns
+        ---------
+        :class:`int`
+            The zero-indexed page number.
+        """
+        if not 0 <= index < len(self.entries):
+            raise IndexError("Item index out of range.")
+        return bisect.bisect_right(self._boundaries, index) - 1
+
+    async def get_page(self, page_number: int) -> Sequence[DataType]:
+        """Returns the slice of the sequence on the page.
+
+        Returns
+        ---------
+        Sequence[Any]
+            The data returned.
+        """
+        if page_number < 0:
+            raise IndexError("Negative page number.")
+        if page_number >= len(self._boundaries) - 1:
+            raise IndexError("Went too far")
+        return self.entries[self._boundaries[page_number] : self._boundaries[page_number + 1]]
+
+    async def format_page(self, menu: Menu, page: Sequence[DataType]) -> PageFormatType:
+        """An abstract method to format the page.
+
+        This works similar to the :meth:`PageSource.format_page` except
+        the type of the ``page`` parameter is documented.
+
+        Parameters
+        ------------
+        menu: :class:`Menu`
+            The menu that wants to format this page.
+        page: Sequence[Any]
+            The page returned by :meth:`get_page`. This is a slice of the sequence.
+
+        Returns
+        ---------
+        Union[:class:`str`, :class:`nextcord.Embed`, List[:class:`nextcord.Embed`], :class:`dict`]
+            See :meth:`PageSource.format_page`.
+        """
+        raise NotImplementedError
+
+
+_token_pattern = re.compile(r"\w+")
+
+
+class FilterablePageSource(PageSource, Generic[DataType]):
+    """A data source wrapping a :class:`ListPageSource` to allow searching its entries.
+
+    Searches are answered from an inverted index mapping every token of the
+    entries' text to the positions of the entries containing it. The index is
+    built the first time :meth:`search` is called, so sources that are never
+    searched do not pay for it. A search only stores the positions of the
+    matching entries in a compact array, which is then paginated with the
+    ``per_page`` and :meth:`format_page` of the wrapped source.
+
+    Searching is case-insensitive and every word of the query must match the
+    start of a word of the entry.
+
+    :class:`ButtonMenuPages` adds a search button opening a :class:`MenuSearchModal`
+    when its source is a :class:`FilterablePageSource`, and :meth:`MenuPages.search`
+    can be used with any menu.
+
+    Parameters
+    ------------
+    source: :class:`ListPageSource`
+        The source whose entries to search.
+    key: Callable[[Any], :class:`str`]
+        A function returning the text of an entry to search.
+        Defaults to :class:`str`.
+
+    Attributes
+    ------------
+    source: :class:`ListPageSource`
+        The source whose entries to search.
+    query: Optional[:class:`str`]
+        The current search query or ``None`` if the entries are not filtered.
+    """
+
+    def __init__(self, source: ListPageSource, *, key: Callable[[Any], str] = str):
+        self.source = source
+        self.key = key
+        self.query: Optional[str] = None
+        self._index: Optional[Dict[str, array.array]] = None
+        self._tokens: List[str] = []
+        self._matches: Optional[array.array] = None
+
+    @property
+    def per_page(self) -> int:
+        """:class:`int`: How many elements are in a page."""
+        return self.source.per_page
+
+    async def prepare(self):
+        await self.source._prepare_once()
+
+    def _build_index(self) -> Dict[str, array.array]:
+        index: Dict[str, array.array] = {}
+        for position, entry in enumerate(self.source.entries):
+            for token in set(_token_pattern.findall(self.key(entry).lower())):
+                postings = index.get(token)
+                if postings is None:
+                    postings = index[token] = array.array("I")
+                postings.append(position)
+        self._tokens = sorted(index)
+        return index
+
+    def _find(self, word: str) -> Set[int]:
+        # the union of the postings of every token starting with the word
+        assert self._index is not None
+        tokens = self._tokens
+        found: Set[int] = set()
+        start = bisect.bisect_left(tokens, word)
+        for token in itertools.islice(tokens, start, None):
+            if not token.startswith(word):
+                break
+            found.update(self._index[token])
+        return found
+
+    def search(self, query: Optional[str]) -> int:
+        """Filters the entries to the ones matching a query.
+
+        The menu has to show a page again for the change to be visible,
+        :meth:`MenuPages.search` takes care of that.
+
+        Parameters
+        ------------
+        query: Optional[:class:`str`]
+            The query to search for. If it is ``None`` or has no words
+            then the filter is removed.
+
+        Returns
+        ---------
+        :class:`int`
+            The number of matching entries.
+        """
+        words = _token_pattern.findall(query.lower()) if query else []
+        if not words:
+            self.query = None
+            self._matches = None
+            return len(self.source.entries)
+
+        if self._index is None:
+            self._index = self._build_index()
+
+        matches: Optional[Set[int]] = None
+        # search the most specific words first, the intersection can only shrink
+        for word in sorted(set(words), key=len, reverse=True):
+            found = self._find(word)
+            matches = found if matches is None else matches & found
+            if not matches:
+                break
+
+        self.query = query
+        self._matches = array.array("I", sorted(matches or ()))
+        return len(self._matches)
+
+    def _count(self) -> int:
+        return len(self.source.entries) if self._matches is None else len(self._matches)
+
+    def is_paginating(self) -> bool:
+        """:class:`bool`: Whether pagination is required."""
+        # the search button stays available when the results fit on a single page
+        return self._matches is not None or self.source.is_paginating()
+
+    def get_max_pages(self) -> int:
+        """:class:`int`: The maximum number of pages required to paginate the matching entries."""
+        pages, left_over = divmod(self._count(), self.per_page)
+        if left_over:
+            pages += 1
+        return pages
+
+    async def get_page(self, page_number: int) -> Union[DataType, List[DataType]]:
+        """Returns either a single matching element or a list of matching elements.
+
+        If :attr:`per_page` is set to ``1`` then this returns a single
+        element. Otherwise it returns at most :attr:`per_page` elements.
+
+        Returns
+        ---------
+        Union[Any, List[Any]]
+            The data returned.
+        """
+        if self._matches is None:
+            return await self.source.get_page(page_number)
+
+        entries = self.source.entries
+        base = page_number * self.per_page
+        page = [entries[position] for position in self._matches[base : base + self.per_page]]
+        if self.per_page == 1:
+            return page[0]
+        return page
+
+    def _get_format_page(self) -> Callable[..., Any]:
+        # the menus call the format_page of the wrapped source directly, so that
+        # they still run it in an executor if it is marked with cpu_bound
+        if type(self).format_page is FilterablePageSource.format_page:
+            return self.source._get_format_page()
+        return self.format_page
+
+    async def format_page(
+        self, menu: Menu, page: Union[DataType, List[DataType]]
+    ) -> PageFormatType:
+        """Formats the page with :meth:`ListPageSource.format_page`
+        of the wrapped source. The menus run it in an executor if it is
+        marked with :func:`cpu_bound`.
+
+        Parameters
+        ------------
+        menu: :class:`Menu`
+            The menu that wants to format this page.
+        page: Union[Any, List[Any]]
+            The page returned by :meth:`get_page`.
+
+        Returns
+        ---------
+        Union[:class:`str`, :class:`nextcord.Embed`, List[:class:`nextcord.Embed`], :class:`dict`]
+            See :meth:`PageSource.format_page`.
+        """
+        return await nextcord.utils.maybe_coroutine(self.source.format_page, menu, page)
@@ -0,0 +1,626 @@
+import asyncio
+import gc
+import json
+import sys
+import time
+import types
+from concurrent.futures import Executor
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Type,
+    Union,
+)
+
+from nextcord.state import ConnectionState
+
+import nextcord
+
+from .constants import log
+from .manager import MenuManager
+from .menu_pages import (
+    PERSISTENT_CUSTOM_IDS,
+    PERSISTENT_SELECT_CUSTOM_ID,
+    ButtonMenuPages,
+    MenuPageSelect,
+)
+from .menus import Menu
+from .page_source import PageSource
+from .sqlite import SQLiteConnectionPool
+
+# type definition for the function rebuilding the source of a menu from its key
+SourceFactoryType = Callable[[str], Union[PageSource, Awaitable[PageSource]]]
+
+# objects shared with the rest of the bot, which are not counted in the size of a menu
+_SHARED_TYPES = (
+    type,
+    types.ModuleType,
+    types.FunctionType,
+    types.BuiltinFunctionType,
+    asyncio.AbstractEventLoop,
+    asyncio.Future,
+    asyncio.Handle,
+    Executor,
+    SQLiteConnectionPool,
+    Menu,
+    MenuManager,
+    nextcord.Client,
+    ConnectionState,
+    nextcord.Guild,
+    nextcord.abc.Messageable,
+    nextcord.Message,
+    nextcord.PartialInteractionMessage,
+    nextcord.Interaction,
+)
+
+
+# the most objects counted when measuring a menu, so that hibernating
+# a menu with a huge source does not block the event loop
+_SIZE_BUDGET = 20000
+
+# the options of the menus kept in their records, so that they are woken up the same
+_RECORDED_OPTIONS = (
+    "delete_message_after",
+    "check_embeds",
+    "clear_buttons_after",
+    "disable_buttons_after",
+    "_jump_to_page",
+    "_page_select",
+    "_style",
+)
+
+
+def _approximate_size(
+    roots: Iterable[Any], *, exclude: Tuple[Any, ...] = (), budget: int = _SIZE_BUDGET
+) -> int:
+    # Sums the sizes of the objects reachable from roots, without following
+    # the objects in exclude or the ones shared with the rest of the bot,
+    # and stopping after budget objects.
+    seen = {id(o) for o in exclude}
+    stack = list(roots)
+    size = 0
+    while stack and budget > 0:
+        current = stack.pop()
+        if id(current) in seen or isinstance(current, _SHARED_TYPES):
+            continue
+        seen.add(id(current))
+        budget -= 1
+        size += sys.getsizeof(current)
+        stack.extend(gc.get_referents(current))
+    return size
+
+
+def _menu_size(menu: ButtonMenuPages, *, exclude: Tuple[Any, ...]) -> int:
+    # Only the state of the menu itself is counted: its source and their
+    # cached pages, its components and its trace, not the manager, the
+    # persistence or other menus it references.
+    roots = (menu.source, menu.children, menu.trace, menu.last_format_timings)
+    return (
+        sys.getsizeof(menu)
+        + sys.getsizeof(vars(menu))
+        + _approximate_size(roots, exclude=(menu, *exclude))
+    )
+
+
+class MenuRecord(NamedTuple):
+    """Named tuple representing the persisted state of a menu.
+
+    Attributes
+    ------------
+    message_id: :class:`int`
+        The ID of the message of the menu.
+    channel_id: :class:`int`
+        The ID of the channel of the message.
+    source_key: :class:`str`
+        The key used to rebuild the source of the menu.
+    page: :class:`int`
+        The page the menu was on.
+    updated_at: :class:`float`
+        The UNIX timestamp of the last change of the menu.
+    options: Optional[Dict[:class:`str`, Any]]
+        The options the menu was created with, such as its ``style`` and
+        ``disable_buttons_after``, as JSON serializable values. They take
+        precedence over the ``menu_kwargs`` of the :class:`MenuPersistence`
+        when the menu is rebuilt. ``None`` for records saved without them.
+    """
+
+    message_id: int
+    channel_id: int
+    source_key: str
+    page: int
+    updated_at: float
+    options: Optional[Dict[str, Any]] = None
+
+
+class MenuStateStore:
+    """An interface for storing the :class:`MenuRecord` of persistent menus.
+
+    Subclasses must implement the following methods:
+
+    - :meth:`save`
+    - :meth:`delete`
+    - :meth:`load`
+    """
+
+    async def save(self, record: MenuRecord):
+        """|coro|
+
+        Inserts or replaces the record of a menu by its message ID.
+
+        Subclasses must implement this.
+
+        Parameters
+        ------------
+        record: :class:`MenuRecord`
+            The record to save.
+        """
+        raise NotImplementedError
+
+    async def delete(self, message_id: int):
+        """|coro|
+
+        Deletes the record of a menu, if any.
+
+        Subclasses must implement this.
+
+        Parameters
+        ------------
+        message_id: :class:`int`
+            The ID of the message of the menu.
+        """
+        raise NotImplementedError
+
+    async def load(self) -> List[MenuRecord]:
+        """|coro|
+
+        Returns all the saved records.
+
+        Subclasses must implement this.
+
+        Returns
+        ---------
+        List[:class:`MenuRecord`]
+            The saved records.
+        """
+        raise NotImplementedError
+
+
+class SQLiteMenuStateStore(MenuStateStore):
+    """A :class:`MenuStateStore` keeping the records in a local SQLite database.
+
+    The queries run on a :class:`SQLiteConnectionPool` with a single connection,
+    so the event loop is never blocked.
+
+    Parameters
+    ------------
+    database: :class:`str`
+        The path of the database. It is created if it does not exist.
+    table: :class:`str`
+        The name of the table to keep the records in. Defaults to ``menu_state``.
+    """
+
+    def __init__(self, database: str, *, table: str = "menu_state"):
+        if not table.isidentifier():
+            raise ValueError("table must be a valid identifier.")
+        self.table = table
+        # autocommit, every statement is a transaction of its own
+        self._pool = SQLiteConnectionPool(database, size=1, isolation_level=None)
+        self._created = False
+
+    async def _fetch(self, query: str, parameters: Any = ()) -> List[Any]:
+        if not self._created:
+            await self._pool.fetch(
+                f"CREATE TABLE IF NOT EXISTS {self.table} ("
+                "message_id INTEGER PRIMARY KEY, channel_id INTEGER NOT NULL, "
+                "source_key TEXT NOT NULL, page INTEGER NOT NULL, updated_at REAL NOT NULL, "
+                "options TEXT)"
+            )
+            # tables created before the options were recorded
+            columns = await self._pool.fetch(f"PRAGMA table_info({self.table})")
+            if "options" not in {column[1] for column in columns}:
+                await self._pool.fetch(f"ALTER TABLE {self.table} ADD COLUMN options TEXT")
+            self._created = True
+        return await self._pool.fetch(query, parameters)
+
+    async def save(self, record: MenuRecord):
+        options = json.dumps(record.options) if record.options is not None else None
+        await self._fetch(
+            f"INSERT OR REPLACE INTO {self.table} "
+            "(message_id, channel_id, source_key, page, updated_at, options) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (*record[:-1], options),
+        )
+
+    async def delete(self, message_id: int):
+        await self._fetch(f"DELETE FROM {self.table} WHERE message_id = ?", (message_id,))
+
+    async def load(self) -> List[MenuRecord]:
+        rows = await self._fetch(
+            "SELECT message_id, channel_id, source_key, page, updated_at, options "
+            f"FROM {self.table}"
+        )
+        return [
+            MenuRecord(*row[:-1], json.loads(row[-1]) if row[-1] is not None else None)
+            for row in rows
+        ]
+
+    def close(self):
+        """Closes the database connection."""
+        self._pool.close()
+
+
+class MenuPersistence:
+    """Keeps the state of :class:`ButtonMenuPages` across bot restarts.
+
+    Menus created with this as their ``persistence`` record their message,
+    page and source key in a :class:`MenuStateStore` while they are running.
+    Page changes are written in the background, at most once every
+    ``save_delay`` seconds per menu, so that button presses never wait on the store.
+    After a restart, :meth:`reattach` registers a lightweight persistent view
+    for every recorded menu. Nothing else is loaded until someone clicks one
+    of its components, at which point the source is rebuilt with
+    ``source_factory``, the menu is restarted on its message at the recorded
+    page and the click is handled as usual.
+
+    The record of a menu is deleted when the menu stops, but not when it only
+    stops because the bot is closing.
+
+    Persisted menus cannot have a timeout, as only views without one keep
+    receiving the clicks on their message. Use ``hibernate_after`` to release
+    the menus nobody uses anymore.
+
+    Menus can also be hibernated while the bot is running: after
+    ``hibernate_after`` seconds without any interaction, a menu is stopped
+    without touching its message and replaced by the same lightweight view,
+    releasing its source, cached pages and tasks. The next click rebuilds it
+    as described above.
+
+    Example
+    ---------
+
+    .. code-block:: python3
+
+        persistence = MenuPersistence(bot, SQLiteMenuStateStore("menus.db"), build_source)
+
+        @bot.event
+        async def on_ready():
+            await persistence.reattach()
+
+        @bot.slash_command()
+        async def leaderboard(interaction):
+            menu = ButtonMenuPages(
+                await build_source("leaderboard"),
+                persistence=persistence,
+                source_key="leaderboard",
+            )
+            await menu.start(interaction=interaction)
+
+    Parameters
+    ------------
+    bot: :class:`nextcord.Client`
+        The bot to register the reattached menus with.
+    store: :class:`MenuStateStore`
+        The store to keep the records in.
+    source_factory: Callable[[:class:`str`], Union[:class:`PageSource`, Awaitable[:class:`PageSource`]]]
+        A function, or coroutine function, returning a new source for a source key.
+    menu_cls: Type[:class:`ButtonMenuPages`]
+        The class of the reattached menus. Defaults to :class:`ButtonMenuPages`.
+    max_age: Optional[:class:`float`]
+        The number of seconds since their last change after which records are
+        discarded instead of being reattached. Defaults to ``None``, which
+        reattaches every record.
+    hibernate_after: Optional[:class:`float`]
+        The number of seconds without any interaction after which running menus
+        are hibernated with :meth:`hibernate`. Defaults to ``None``, which
+        never hibernates menus.
+    save_delay: :class:`float`
+        The number of seconds during which the page changes of a menu are merged
+        into a single write to the store. Defaults to ``1.0``.
+    \\*\\*menu_kwargs
+        Additional keyword arguments passed to ``menu_cls`` when reattaching.
+        The options recorded from the original menu take precedence over them.
+        The reattached menus never have a timeout.
+
+    Attributes
+    ------------
+    bot: :class:`nextcord.Client`
+        The bot to register the reattached menus with.
+    store: :class:`MenuStateStore`
+        The store the records are kept in.
+    """
+
+    def __init__(
+        self,
+        bot: nextcord.Client,
+        store: MenuStateStore,
+        source_factory: SourceFactoryType,
+        *,
+        menu_cls: Type[ButtonMenuPages] = ButtonMenuPages,
+        max_age: Optional[float] = None,
+        hibernate_after: Optional[float] = None,
+        save_delay: float = 1.0,
+        **menu_kwargs: Any,
+    ):
+        self.bot = bot
+        self.store = store
+        self.source_factory = source_factory
+        self.menu_cls = menu_cls
+        self.max_age = max_age
+        self.hibernate_after = hibernate_after
+        self.save_delay = save_delay
+        self.menu_kwargs = menu_kwargs
+        self._dormant: Dict[int, _DormantMenuView] = {}
+        self._timers: Dict[int, asyncio.TimerHandle] = {}
+        # the delayed saves of the menus, and the saves being written
+        self._save_handles: Dict[ButtonMenuPages, asyncio.TimerHandle] = {}
+        self._save_tasks: Dict[ButtonMenuPages, asyncio.Future] = {}
+
+    async def _get_record(self, menu: ButtonMenuPages) -> Optional[MenuRecord]:
+        message = menu.message
+        if message is None or menu.source_key is None:
+            return None
+        if isinstance(message, nextcord.PartialInteractionMessage):
+            # the ID of the message is needed to reattach the menu
+            menu.message = message = await message.fetch()
+
+        return MenuRecord(
+            message_id=message.id,
+            channel_id=message.channel.id,
+            source_key=menu.source_key,
+            page=menu.current_page,
+            updated_at=time.time(),
+            options=self._get_options(menu),
+        )
+
+    @staticmethod
+    def _get_options(menu: ButtonMenuPages) -> Dict[str, Any]:
+        options: Dict[str, Any] = {}
+        for attribute in _RECORDED_OPTIONS:
+            value = getattr(menu, attribute, None)
+            if isinstance(value, nextcord.ButtonStyle):
+                value = value.value
+            if value is not None:
+                options[attribute.lstrip("_")] = value
+        return options
+
+    def _get_menu_kwargs(self, record: MenuRecord) -> Dict[str, Any]:
+        kwargs = {**self.menu_kwargs, **(record.options or {})}
+        # only views without a timeout can be registered for a message
+        kwargs["timeout"] = None
+        if "style" in kwargs and not isinstance(kwargs["style"], nextcord.ButtonStyle):
+            kwargs["style"] = nextcord.ButtonStyle(kwargs["style"])
+        return kwargs
+
+    async def _save(self, menu: ButtonMenuPages):
+        record = await self._get_record(menu)
+        if record is None:
+            return
+        try:
+            await self.store.save(record)
+        except Exception:
+            log.exception("Failed to save the state of menu %r.", menu)
+        self._touch(menu)
+
+    def _touch(self, menu: ButtonMenuPages):
+        # restarts the countdown to hibernating the menu, on every use of it
+        message = menu.message
+        if self.hibernate_after is None or message is None:
+            return
+        if isinstance(message, nextcord.PartialInteractionMessage):
+            return
+        timer = self._timers.pop(message.id, None)
+        if timer is not None:
+            timer.cancel()
+        self._timers[message.id] = asyncio.get_running_loop().call_later(
+            self.hibernate_after, self._hibernate_idle, menu
+        )
+
+    def _schedule_save(self, menu: ButtonMenuPages):
+        # saves merged until save_delay has passed since the first one
+        if menu not in self._save_handles:
+            self._save_handles[menu] = asyncio.get_running_loop().call_later(
+                self.save_delay, self._start_save, menu
+            )
+
+    def _start_save(self, menu: ButtonMenuPages):
+        self._save_handles.pop(menu, None)
+        task = self._save_tasks[menu] = asyncio.ensure_future(self._save(menu))
+        task.add_done_callback(lambda _: self._save_done(menu, task))
+
+    def _save_done(self, menu: ButtonMenuPages, task: asyncio.Future):
+        if self._save_tasks.get(menu) is task:
+            del self._save_tasks[menu]
+
+    async def _flush(self, menu: ButtonMenuPages, *, save: bool = True):
+        # writes the delayed save of a menu now, or drops it, and waits
+        # for the save being written so that it cannot land afterwards
+        handle = self._save_handles.pop(menu, None)
+        if handle is not None:
+            handle.cancel()
+        task = self._save_tasks.get(menu)
+        if task is not None:
+            await asyncio.wait([task])
+        if handle is not None and save:
+            await self._save(menu)
+
+    def _hibernate_idle(self, menu: ButtonMenuPages):
+        asyncio.ensure_future(self.hibernate(menu))
+
+    async def _forget(self, menu: ButtonMenuPages):
+        await self._flush(menu, save=False)
+        message = menu.message
+        if message is None or isinstance(message, nextcord.PartialInteractionMessage):
+            return
+        timer = self._timers.pop(message.id, None)
+        if timer is not None:
+            timer.cancel()
+        try:
+            await self.store.delete(message.id)
+        except Exception:
+            log.exception("Failed to delete the state of menu %r.", menu)
+
+    async def reattach(self) -> int:
+        """|coro|
+
+        Registers a persistent view for every recorded menu so that they
+        respond to clicks again. This should be called once the bot is ready.
+
+        Returns
+        ---------
+        :class:`int`
+            The number of reattached menus.
+        """
+        now = time.time()
+        count = 0
+        for record in await self.store.load():
+            if self.max_age is not None and now - record.updated_at > self.max_age:
+                await self.store.delete(record.message_id)
+                continue
+            if record.message_id in self._dormant:
+                continue
+            view = _DormantMenuView(self, record)
+            self._dormant[record.message_id] = view
+            self.bot.add_view(view, message_id=record.message_id)
+            count += 1
+        return count
+
+    async def hibernate(self, menu: ButtonMenuPages) -> int:
+        """|coro|
+
+        Hibernates a running menu.
+
+        The menu is stopped without being finalized or editing its message,
+        and a lightweight view holding its record takes over its components,
+        so that nothing else references the menu, its source and their cached
+        pages. The menu is rebuilt with ``source_factory`` on the next click.
+
+        This is called automatically for menus idle for ``hibernate_after``
+        seconds. Menus that are not running or have no message are left alone.
+
+        Parameters
+        ------------
+        menu: :class:`ButtonMenuPages`
+            The menu to hibernate. It must use this persistence.
+
+        Returns
+        ---------
+        :class:`int`
+            The approximate number of bytes released by replacing the menu
+            with its record, or ``0`` if the menu was not hibernated. Only the
+            state of the menu itself is counted, up to a fixed number of objects.
+        """
+        if not menu._running or menu._leave_message:
+            return 0
+        await self._flush(menu)
+        record = await self._get_record(menu)
+        if record is None:
+            return 0
+        timer = self._timers.pop(record.message_id, None)
+        if timer is not None:
+            timer.cancel()
+
+        shared = (self, self.bot, menu.ctx)
+        size = _menu_size(menu, exclude=shared)
+        menu._leave_message = True
+        menu.stop()
+
+        view = _DormantMenuView(self, record, type(menu))
+        self._dormant[record.message_id] = view
+        self.bot.add_view(view, message_id=record.message_id)
+
+        view_size = sys.getsizeof(view) + _approximate_size(
+            (vars(view), view.children), exclude=(view, *shared)
+        )
+        reclaimed = max(size - view_size, 0)
+        log.debug(
+            "Hibernated menu %r of message %s, releasing about %d bytes.",
+            menu,
+            record.message_id,
+            reclaimed,
+        )
+        return reclaimed
+
+    async def _wake(
+        self, view: "_DormantMenuView", item: nextcord.ui.Item, interaction: nextcord.Interaction
+    ):
+        record = view.record
+        async with view.lock:
+            menu = view.menu
+            if menu is None:
+                source = await nextcord.utils.maybe_coroutine(
+                    self.source_factory, record.source_key
+                )
+                menu = view.menu_cls(
+                    source,
+                    persistence=self,
+                    source_key=record.source_key,
+                    message=interaction.message,
+                    **self._get_menu_kwargs(record),
+                )
+                menu.current_page = record.page
+                # the dormant view is retired first, so that a failure to start
+                # cannot leave it building a new menu on every click
+                view.menu = menu
+                self._dormant.pop(record.message_id, None)
+                view.stop()
+                await menu.start(interaction=interaction)
+                # the menu takes over the components of the message
+                self.bot.add_view(menu, message_id=record.message_id)
+
+        custom_id = getattr(item, "custom_id", None)
+        for child in menu.children:
+            if getattr(child, "custom_id", None) != custom_id:
+                continue
+            if isinstance(child, MenuPageSelect) and isinstance(item, nextcord.ui.Select):
+                await child._select(interaction, item.values[0])
+            else:
+                await child.callback(interaction)
+            return
+
+        # the component does not exist anymore, e.g. the source has fewer pages now
+        await menu.show_current_page()
+
+
+class _DormantButton(nextcord.ui.Button["_DormantMenuView"]):
+    async def callback(self, interaction: nextcord.Interaction):
+        assert self.view is not None
+        await self.view.persistence._wake(self.view, self, interaction)
+
+
+class _DormantSelect(nextcord.ui.Select["_DormantMenuView"]):
+    async def callback(self, interaction: nextcord.Interaction):
+        assert self.view is not None
+        await self.view.persistence._wake(self.view, self, interaction)
+
+
+class _DormantMenuView(nextcord.ui.View):
+    # A view with the stable custom IDs of every pagination component,
+    # standing in for a menu until one of them is clicked.
+
+    def __init__(
+        self,
+        persistence: MenuPersistence,
+        record: MenuRecord,
+        menu_cls: Optional[Type[ButtonMenuPages]] = None,
+    ):
+        super().__init__(timeout=None)
+        self.persistence = persistence
+        self.record = record
+        self.menu_cls = menu_cls or persistence.menu_cls
+        self.menu: Optional[ButtonMenuPages] = None
+        self.lock = asyncio.Lock()
+        for custom_id in PERSISTENT_CUSTOM_IDS.values():
+            self.add_item(_DormantButton(custom_id=custom_id))
+        self.add_item(
+            _DormantSelect(
+                custom_id=PERSISTENT_SELECT_CUSTOM_ID,
+                options=[nextcord.SelectOption(label="-")],
+            )
+        )
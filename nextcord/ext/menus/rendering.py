@@ -0,0 +1,212 @@
+import asyncio
+import io
+from collections import OrderedDict
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Any, Callable, Dict, Hashable, Optional, OrderedDict as OrderedDictT, Tuple
+
+import nextcord
+
+# type definition for the key of a rendered page, (source fingerprint, page number)
+RenderKeyType = Tuple[Hashable, int]
+
+
+class ImagePageRenderer:
+    """Renders page images in a process pool and caches the rendered bytes.
+
+    This is meant to be used from :meth:`PageSource.format_page` for pages that
+    are images, such as charts, so that rendering does not block the event loop
+    and pages that were already viewed are not rendered again.
+
+    The ``render`` function receives the page data and returns the encoded
+    image. As it runs in another process, both the function and the page data
+    must be picklable, so the function must be defined at the top level of a module.
+
+    Rendered images are cached by the fingerprint of the source and the page
+    number. The fingerprint should change whenever the data of the source does,
+    e.g. a tuple of an identifier and a version. The least recently used images
+    are evicted once the cache exceeds ``max_cache_bytes``.
+
+    Example
+    ---------
+
+    .. code-block:: python3
+
+        def render_chart(entries):
+            ...  # draw the chart
+            return png_bytes
+
+        renderer = ImagePageRenderer(render_chart, max_workers=2)
+
+        class ChartSource(ListPageSource):
+            async def format_page(self, menu, entries):
+                file = await renderer.render_file(
+                    ("scores", version), menu.current_page, entries, filename="chart.png"
+                )
+                embed = nextcord.Embed().set_image(url="attachment://chart.png")
+                return {"embed": embed, "file": file}
+
+    Parameters
+    ------------
+    render: Callable[[Any], :class:`bytes`]
+        The picklable function rendering the page data to image bytes.
+    max_workers: Optional[:class:`int`]
+        The number of worker processes. Defaults to the number of processors.
+        This is ignored if ``executor`` is given.
+    max_cache_bytes: :class:`int`
+        The maximum total size of the cached images in bytes. Defaults to 32 MiB.
+        Images larger than this are not cached.
+    executor: Optional[:class:`concurrent.futures.Executor`]
+        The executor to render in. If not given then a
+        :class:`~concurrent.futures.ProcessPoolExecutor` is created on first use.
+
+    Attributes
+    ------------
+    max_cache_bytes: :class:`int`
+        The maximum total size of the cached images in bytes.
+    hits: :class:`int`
+        The number of renders that were served from the cache.
+    misses: :class:`int`
+        The number of renders that had to be done in the pool.
+    """
+
+    def __init__(
+        self,
+        render: Callable[[Any], bytes],
+        *,
+        max_workers: Optional[int] = None,
+        max_cache_bytes: int = 32 * 1024 * 1024,
+        executor: Optional[Executor] = None,
+    ):
+        self._render = render
+        self._max_workers = max_workers
+        self._executor = executor
+        self._owns_executor = executor is None
+        self.max_cache_bytes = max_cache_bytes
+        self._cache: OrderedDictT[RenderKeyType, bytes] = OrderedDict()
+        self._cache_bytes = 0
+        self._pending: Dict[RenderKeyType, asyncio.Future] = {}
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def cache_bytes(self) -> int:
+        """:class:`int`: The total size of the cached images in bytes."""
+        return self._cache_bytes
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            # started lazily so that creating a renderer does not spawn processes
+            self._executor = ProcessPoolExecutor(max_workers=self._max_workers)
+        return self._executor
+
+    def _cache_image(self, key: RenderKeyType, image: bytes):
+        if len(image) > self.max_cache_bytes:
+            return
+        self._cache[key] = image
+        self._cache_bytes += len(image)
+        while self._cache_bytes > self.max_cache_bytes:
+            _, evicted = self._cache.popitem(last=False)
+            self._cache_bytes -= len(evicted)
+
+    async def _render_image(self, key: RenderKeyType, data: Any) -> bytes:
+        loop = asyncio.get_running_loop()
+        try:
+            image = await loop.run_in_executor(self._get_executor(), self._render, data)
+            self._cache_image(key, image)
+            return image
+        finally:
+            self._pending.pop(key, None)
+
+    async def render(self, fingerprint: Hashable, page_number: int, data: Any) -> bytes:
+        """|coro|
+
+        Returns the rendered image of a page, rendering it if it is not cached.
+
+        Concurrent calls for the same page share a single render.
+
+        Parameters
+        ------------
+        fingerprint: Hashable
+            The fingerprint of the source the page belongs to.
+        page_number: :class:`int`
+            The number of the page.
+        data: Any
+            The picklable page data to render. It is only used on a cache miss.
+
+        Returns
+        --------
+        :class:`bytes`
+            The rendered image.
+        """
+        key = (fingerprint, page_number)
+        image = self._cache.get(key)
+        if image is not None:
+            self._cache.move_to_end(key)
+            self.hits += 1
+            return image
+
+        future = self._pending.get(key)
+        if future is None:
+            self.misses += 1
+            future = self._pending[key] = asyncio.ensure_future(self._render_image(key, data))
+        # A cancelled waiter must not cancel a render shared with other waiters
+        return await asyncio.shield(future)
+
+    async def render_file(
+        self, fingerprint: Hashable, page_number: int, data: Any, *, filename: str
+    ) -> nextcord.File:
+        """|coro|
+
+        Same as :meth:`render` except the image is returned as a
+        :class:`nextcord.File` ready to be returned in the ``file``
+        keyword argument of :meth:`PageSource.format_page`.
+
+        Parameters
+        ------------
+        fingerprint: Hashable
+            The fingerprint of the source the page belongs to.
+        page_number: :class:`int`
+            The number of the page.
+        data: Any
+            The picklable page data to render. It is only used on a cache miss.
+        filename: :class:`str`
+            The filename of the attachment.
+
+        Returns
+        --------
+        :class:`nextcord.File`
+            The rendered image.
+        """
+        image = await self.render(fingerprint, page_number, data)
+        return nextcord.File(io.BytesIO(image), filename=filename)
+
+    def invalidate(self, fingerprint: Optional[Hashable] = None):
+        """Removes cached images.
+
+        Parameters
+        ------------
+        fingerprint: Optional[Hashable]
+            The fingerprint of the source whose images to remove.
+            If not given then the whole cache is cleared.
+        """
+        if fingerprint is None:
+            self._cache.clear()
+            self._cache_bytes = 0
+            return
+
+        for key in [key for key in self._cache if key[0] == fingerprint]:
+            self._cache_bytes -= len(self._cache.pop(key))
+
+    def shutdown(self, *, wait: bool = True):
+        """Shuts down the worker processes if they were created by the renderer
+        and clears the cache.
+
+        Parameters
+        ------------
+        wait: :class:`bool`
+            Whether to wait for renders in progress to finish.
+        """
+        if self._owns_executor and self._executor is not None:
+            self._executor.shutdown(wait=wait)
+            self._executor = None
+        self.invalidate()
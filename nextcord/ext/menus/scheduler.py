@@ -0,0 +1,214 @@
+import asyncio
+from collections import OrderedDict, deque
+from typing import Any, Deque, Dict, Hashable, Optional, OrderedDict as OrderedDictT, Union
+
+import nextcord
+
+from .constants import SendKwargsType, log
+
+# type definition for the messages of menus
+MessageType = Union[nextcord.Message, nextcord.PartialInteractionMessage]
+
+# the keyword arguments of message.edit that cannot be passed together
+_EXCLUSIVE_KWARGS = {"embed": "embeds", "embeds": "embed", "file": "files", "files": "file"}
+
+
+class _PendingEdit:
+    __slots__ = ("message", "kwargs", "future")
+
+    def __init__(self, message: MessageType, kwargs: SendKwargsType, future: asyncio.Future):
+        self.message = message
+        self.kwargs = kwargs
+        self.future = future
+
+
+class _ChannelQueue:
+    __slots__ = ("pending", "sent", "worker")
+
+    def __init__(self, rate: int):
+        # pending edits by message, in the order they were first requested
+        self.pending: OrderedDictT[Hashable, _PendingEdit] = OrderedDict()
+        # the times of the latest edits, to space out the next ones
+        self.sent: Deque[float] = deque(maxlen=rate)
+        self.worker: Optional[asyncio.Task] = None
+
+
+class EditScheduler:
+    """Queues the message edits of menus per channel to stay within rate limits.
+
+    This is passed as the ``edit_scheduler`` of a :class:`MenuManager`, and the
+    menus of the manager then edit their message through :meth:`edit`.
+
+    Edits are sent one at a time per channel, and at most ``rate`` edits are
+    sent in a channel every ``per`` seconds, instead of bursting until Discord
+    responds with 429s and every request of the bot waits. While an edit of a
+    message is queued, newer edits of the same message are merged into it, so
+    that only the latest state of a menu is sent when it is clicked repeatedly.
+
+    Parameters
+    ------------
+    rate: :class:`int`
+        The number of edits that can be sent in a channel every ``per`` seconds.
+        Defaults to ``5``.
+    per: :class:`float`
+        The length of the window of ``rate`` edits in seconds. Defaults to ``5.0``.
+
+    Attributes
+    ------------
+    sent: :class:`int`
+        The number of edits sent.
+    coalesced: :class:`int`
+        The number of edits merged into an edit that was already queued.
+    rate_limits: :class:`int`
+        The number of rate limits reported by the bot since the first edit,
+        either 429 responses or exhausted buckets. Exhausted buckets are only
+        counted if the bot supports ``add_listener``, like
+        :class:`~nextcord.ext.commands.Bot`. With a plain :class:`nextcord.Client`,
+        only the 429 responses to the edits of the scheduler are counted.
+    """
+
+    def __init__(self, *, rate: int = 5, per: float = 5.0):
+        if rate < 1:
+            raise ValueError("rate must be at least 1.")
+        self.rate = rate
+        self.per = per
+        self.sent = 0
+        self.coalesced = 0
+        self.rate_limits = 0
+        self._queues: Dict[Optional[int], _ChannelQueue] = {}
+        self._listening = False
+
+    @property
+    def queue_depth(self) -> int:
+        """:class:`int`: The number of edits waiting to be sent in every channel."""
+        return sum(len(queue.pending) for queue in self._queues.values())
+
+    def get_queue_depth(self, channel_id: Optional[int]) -> int:
+        """Returns the number of edits waiting to be sent in a channel.
+
+        Parameters
+        ------------
+        channel_id: Optional[:class:`int`]
+            The ID of the channel.
+
+        Returns
+        ---------
+        :class:`int`
+            The number of queued edits.
+        """
+        queue = self._queues.get(channel_id)
+        return len(queue.pending) if queue is not None else 0
+
+    async def _on_rate_limit(self, *args: Any):
+        self.rate_limits += 1
+
+    def _listen(self, message: MessageType):
+        # count the rate limits of the bot sending the edits
+        state = getattr(message, "_state", None)
+        client = state._get_client() if state is not None else None
+        add_listener = getattr(client, "add_listener", None)
+        self._listening = True
+        if add_listener is None:
+            log.debug("%r cannot listen to the rate limits of %r.", self, client)
+            return
+        add_listener(self._on_rate_limit, "on_http_ratelimit")
+        add_listener(self._on_rate_limit, "on_global_http_ratelimit")
+
+    async def edit(self, message: MessageType, **kwargs: Any) -> Any:
+        """|coro|
+
+        Queues an edit of a message and waits until it is sent.
+
+        If an edit of the same message is already queued, the keyword
+        arguments are merged into it, the newer ones taking precedence. A newer
+        ``embed`` or ``file`` replaces a queued ``embeds`` or ``files`` and vice
+        versa, as they cannot be passed together.
+
+        Parameters
+        ------------
+        message: Union[:class:`nextcord.Message`, :class:`nextcord.PartialInteractionMessage`]
+            The message to edit.
+        \\*\\*kwargs
+            The keyword arguments passed to ``message.edit``.
+
+        Returns
+        ---------
+        Any
+            The return value of ``message.edit``.
+        """
+        if not self._listening:
+            self._listen(message)
+
+        channel_id = getattr(getattr(message, "channel", None), "id", None)
+        queue = self._queues.get(channel_id)
+        if queue is None:
+            queue = self._queues[channel_id] = _ChannelQueue(self.rate)
+
+        key = getattr(message, "id", None) or id(message)
+        pending = queue.pending.get(key)
+        if pending is not None:
+            pending.message = message
+            for name in kwargs:
+                exclusive = _EXCLUSIVE_KWARGS.get(name)
+                if exclusive is not None:
+                    pending.kwargs.pop(exclusive, None)
+            pending.kwargs.update(kwargs)
+            self.coalesced += 1
+        else:
+            future = asyncio.get_running_loop().create_future()
+            pending = queue.pending[key] = _PendingEdit(message, kwargs, future)
+
+        if queue.worker is None:
+            queue.worker = asyncio.ensure_future(self._send(channel_id, queue))
+        # the edit may be shared with other callers, which must not cancel it
+        return await asyncio.shield(pending.future)
+
+    async def _send(self, channel_id: Optional[int], queue: _ChannelQueue):
+        loop = asyncio.get_running_loop()
+        pending: Optional[_PendingEdit] = None
+        try:
+            while queue.pending:
+                if len(queue.sent) == self.rate:
+                    delay = queue.sent[0] + self.per - loop.time()
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+                # edits keep being merged into the next one until it is sent
+                _, pending = queue.pending.popitem(last=False)
+                queue.sent.append(loop.time())
+                self.sent += 1
+                try:
+                    result = await pending.message.edit(**pending.kwargs)
+                except Exception as exc:
+                    if isinstance(exc, nextcord.HTTPException) and exc.status == 429:
+                        self.rate_limits += 1
+                    pending.future.set_exception(exc)
+                else:
+                    pending.future.set_result(result)
+        except asyncio.CancelledError:
+            # the queued edits are cancelled by close, but not the one being sent
+            if pending is not None:
+                pending.future.cancel()
+            raise
+        finally:
+            queue.worker = None
+            # the queue remembers the latest edits until they leave the window
+            remaining = queue.sent[-1] + self.per - loop.time() if queue.sent else 0
+            loop.call_later(max(remaining, 0), self._prune, channel_id, queue)
+
+    def _prune(self, channel_id: Optional[int], queue: _ChannelQueue):
+        if queue.worker is None and not queue.pending and self._queues.get(channel_id) is queue:
+            del self._queues[channel_id]
+
+    def close(self):
+        """Cancels every queued edit."""
+        for queue in list(self._queues.values()):
+            for pending in queue.pending.values():
+                pending.future.cancel()
+            queue.pending.clear()
+            if queue.worker is not None:
+                queue.worker.cancel()
+
+    def __repr__(self) -> str:
+        return "<{0.__class__.__name__} rate={0.rate} per={0.per} queue_depth={1}>".format(
+            self, self.queue_depth
+        )
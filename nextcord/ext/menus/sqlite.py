@@ -0,0 +1,208 @@
+import asyncio
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Union
+
+from .page_source import DataType, OffsetPageSource
+
+# type definition for the parameters of a query
+ParametersType = Union[Sequence[Any], Mapping[str, Any]]
+
+
+class SQLiteConnectionPool:
+    """A small pool of SQLite connections used from a dedicated thread pool.
+
+    Every worker thread of the pool opens its own connection on first use,
+    so queries run concurrently without ever blocking the event loop.
+
+    Queries awaited through :meth:`fetch` are interrupted with
+    :meth:`sqlite3.Connection.interrupt` when the awaiting task is cancelled.
+
+    Parameters
+    ------------
+    database: :class:`str`
+        The path of the database, passed to :func:`sqlite3.connect`.
+    size: :class:`int`
+        The maximum number of connections and worker threads. Defaults to 4.
+    row_factory: Optional[Callable[[:class:`sqlite3.Cursor`, :class:`tuple`], Any]]
+        The row factory to set on the connections, e.g. :class:`sqlite3.Row`.
+        Defaults to ``None``, which returns rows as tuples.
+    \\*\\*kwargs
+        Additional keyword arguments passed to :func:`sqlite3.connect`.
+
+    Attributes
+    ------------
+    database: :class:`str`
+        The path of the database.
+    size: :class:`int`
+        The maximum number of connections and worker threads.
+    """
+
+    def __init__(
+        self,
+        database: str,
+        *,
+        size: int = 4,
+        row_factory: Optional[Callable[[sqlite3.Cursor, tuple], Any]] = None,
+        **kwargs: Any,
+    ):
+        self.database = database
+        self.size = size
+        self._row_factory = row_factory
+        self._connect_kwargs = kwargs
+        self._executor = ThreadPoolExecutor(
+            max_workers=size, thread_name_prefix="nextcord-ext-menus-sqlite"
+        )
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+
+    def _get_connection(self) -> sqlite3.Connection:
+        # runs in a worker thread, which owns the connection
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            # the connection may be interrupted and closed from other threads
+            connection = sqlite3.connect(
+                self.database, check_same_thread=False, **self._connect_kwargs
+            )
+            connection.row_factory = self._row_factory
+            self._local.connection = connection
+            with self._connections_lock:
+                self._connections.append(connection)
+        return connection
+
+    def _fetch(
+        self, running: List[sqlite3.Connection], query: str, parameters: ParametersType
+    ) -> List[Any]:
+        connection = self._get_connection()
+        running.append(connection)
+        try:
+            return connection.execute(query, parameters).fetchall()
+        finally:
+            running.clear()
+
+    async def fetch(self, query: str, parameters: ParametersType = ()) -> List[Any]:
+        """|coro|
+
+        Runs a query on one of the connections and returns all of its rows.
+
+        Parameters
+        ------------
+        query: :class:`str`
+            The SQL query to run.
+        parameters: Union[Sequence[Any], Mapping[:class:`str`, Any]]
+            The parameters of the query.
+
+        Returns
+        --------
+        List[Any]
+            The rows returned by the query.
+        """
+        loop = asyncio.get_running_loop()
+        running: List[sqlite3.Connection] = []
+        future = loop.run_in_executor(self._executor, self._fetch, running, query, parameters)
+        try:
+            return await future
+        except asyncio.CancelledError:
+            # the thread cannot be cancelled, but the query it is running can
+            for connection in running:
+                connection.interrupt()
+            raise
+
+    def close(self):
+        """Closes all connections and shuts down the worker threads.
+
+        Queries that are in progress are interrupted.
+        """
+        with self._connections_lock:
+            connections = self._connections.copy()
+            self._connections.clear()
+        for connection in connections:
+            connection.interrupt()
+        self._executor.shutdown(wait=True)
+        for connection in connections:
+            connection.close()
+
+
+class SQLitePageSource(OffsetPageSource[DataType]):
+    """A data source for the rows of an SQLite query.
+
+    This inherits from :class:`OffsetPageSource`.
+
+    The query is run through a :class:`SQLiteConnectionPool` with ``LIMIT``
+    and ``OFFSET`` appended, one block of rows at a time, so the event loop is
+    never blocked and only the rows around the current page are kept in memory.
+    The number of rows is counted with ``COUNT(*)`` once, when the source is prepared.
+
+    Fetches in progress are cancelled, and the queries interrupted, when the
+    menu is stopped.
+
+    This page source does not handle any sort of formatting, leaving it up
+    to the user. To do so, implement the :meth:`format_page` method.
+
+    .. note::
+
+        The query should have an ``ORDER BY`` clause over a unique set of columns
+        so that the order of the rows is stable across fetches.
+
+    Parameters
+    ------------
+    pool: :class:`SQLiteConnectionPool`
+        The connection pool used to run the queries.
+    query: :class:`str`
+        The ``SELECT`` query whose rows to paginate.
+    parameters: Union[Sequence[Any], Mapping[:class:`str`, Any]]
+        The parameters of the query.
+    per_page: :class:`int`
+        How many rows to have per page.
+    block_size: Optional[:class:`int`]
+        How many rows to fetch at once. See :class:`OffsetPageSource`.
+    max_cached_blocks: :class:`int`
+        The maximum number of blocks to keep in the cache. See :class:`OffsetPageSource`.
+
+    Attributes
+    ------------
+    pool: :class:`SQLiteConnectionPool`
+        The connection pool used to run the queries.
+    query: :class:`str`
+        The query whose rows to paginate.
+    parameters: Union[Sequence[Any], Mapping[:class:`str`, Any]]
+        The parameters of the query.
+    per_page: :class:`int`
+        How many rows are in a page.
+    """
+
+    def __init__(
+        self,
+        pool: SQLiteConnectionPool,
+        query: str,
+        parameters: ParametersType = (),
+        *,
+        per_page: int,
+        block_size: Optional[int] = None,
+        max_cached_blocks: int = 16,
+    ):
+        self.pool = pool
+        self.query = query
+        self.parameters = parameters
+        super().__init__(
+            self._fetch_rows,
+            self._count_rows,
+            per_page=per_page,
+            block_size=block_size,
+            max_cached_blocks=max_cached_blocks,
+        )
+
+    async def _fetch_rows(self, offset: int, limit: int) -> List[DataType]:
+        parameters = self.parameters
+        if isinstance(parameters, Mapping):
+            query = f"SELECT * FROM ({self.query}) LIMIT :_menus_limit OFFSET :_menus_offset"
+            named: Dict[str, Any] = {**parameters, "_menus_limit": limit, "_menus_offset": offset}
+            return await self.pool.fetch(query, named)
+        query = f"SELECT * FROM ({self.query}) LIMIT ? OFFSET ?"
+        return await self.pool.fetch(query, (*parameters, limit, offset))
+
+    async def _count_rows(self) -> int:
+        rows = await self.pool.fetch(f"SELECT COUNT(*) FROM ({self.query})", self.parameters)
+        return rows[0][0]
@@ -0,0 +1,135 @@
+import array
+import time
+from typing import Any, List, NamedTuple
+
+# the kinds of events, recorded by their index to keep the buffer compact
+EVENT_KINDS = (
+    "start",
+    "reaction",
+    "interaction",
+    "lock",
+    "button",
+    "render",
+    "edit",
+    "timeout",
+    "stop",
+    "finalize",
+    "error",
+)
+_KIND_INDEXES = {kind: index for index, kind in enumerate(EVENT_KINDS)}
+
+
+class MenuEvent(NamedTuple):
+    """Named tuple representing an event recorded in a :class:`MenuTrace`.
+
+    Attributes
+    ------------
+    timestamp: :class:`float`
+        When the event happened, from :func:`time.monotonic`.
+    kind: :class:`str`
+        The kind of the event, one of:
+
+        - ``start``: the menu started.
+        - ``reaction``: a reaction was received, the detail is its emoji.
+        - ``interaction``: a component interaction was received, the detail is its custom ID.
+        - ``lock``: the locks of a reaction button were acquired, the detail is its emoji.
+        - ``button``: the action of a button was dispatched, the detail is its emoji.
+        - ``render``: a page was formatted, the detail is its page number.
+        - ``edit``: the message was edited.
+        - ``timeout``: the menu timed out.
+        - ``stop``: the menu was stopped.
+        - ``finalize``: the menu is being finalized, the detail is whether it timed out.
+        - ``error``: a button raised an error, the detail is the exception.
+    detail: Any
+        Some context about the event, or ``None``.
+    """
+
+    timestamp: float
+    kind: str
+    detail: Any
+
+
+class MenuTrace:
+    """A fixed-size ring buffer of the latest lifecycle events of a menu.
+
+    Every menu keeps one as :attr:`Menu.trace`, recording events as they happen,
+    so that the last moments of a slow or stuck menu can be inspected without
+    verbose logging. Once the buffer is full, new events overwrite the oldest.
+
+    Recording an event only writes into preallocated arrays.
+
+    Parameters
+    ------------
+    size: :class:`int`
+        The number of events to keep. ``0`` records nothing.
+    """
+
+    __slots__ = ("size", "_kinds", "_timestamps", "_details", "_count")
+
+    def __init__(self, size: int):
+        if size < 0:
+            raise ValueError("size cannot be negative.")
+        self.size = size
+        self._kinds = array.array("B", bytes(size))
+        self._timestamps = array.array("d", bytes(8 * size))
+        self._details: List[Any] = [None] * size
+        # the total number of recorded events, the next one goes at _count % size
+        self._count = 0
+
+    def _record(self, kind: str, detail: Any = None):
+        if not self.size:
+            return
+        index = self._count % self.size
+        self._kinds[index] = _KIND_INDEXES[kind]
+        self._timestamps[index] = time.monotonic()
+        self._details[index] = detail
+        self._count += 1
+
+    def __len__(self) -> int:
+        return min(self._count, self.size)
+
+    def events(self) -> List[MenuEvent]:
+        """Returns the recorded events, from the oldest to the newest.
+
+        Returns
+        ---------
+        List[:class:`MenuEvent`]
+            The events.
+        """
+        first = self._count - len(self)
+        return [
+            MenuEvent(
+                self._timestamps[index % self.size],
+                EVENT_KINDS[self._kinds[index % self.size]],
+                self._details[index % self.size],
+            )
+            for index in range(first, self._count)
+        ]
+
+    def format(self) -> str:
+        """Returns the recorded events as text, one per line, with how long
+        ago each of them happened.
+
+        Returns
+        ---------
+        :class:`str`
+            The formatted events.
+        """
+        now = time.monotonic()
+        return "\n".join(
+            "{0:>10.3f}s ago {1.kind}{2}".format(
+                now - event.timestamp,
+                event,
+                "" if event.detail is None else " " + repr(event.detail),
+            )
+            for event in self.events()
+        )
+
+    def clear(self):
+        """Forgets every recorded event."""
+        for index in range(self.size):
+            self._details[index] = None
+        self._count = 0
+
+    def __repr__(self) -> str:
+        return "<{0.__class__.__name__} size={0.size} events={1}>".format(self, len(self))
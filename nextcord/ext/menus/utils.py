@@ -1,5 +1,6 @@
 import re
-from typing import Pattern
+from collections import OrderedDict
+from typing import Any, NoReturn, Optional, OrderedDict as OrderedDictT, Pattern, Union
 
 import nextcord
 
@@ -99,16 +100,79 @@ class Last(Position):
 _custom_emoji = re.compile(r"<?(?P<animated>a)?:?(?P<name>[A-Za-z0-9\_]+):(?P<id>[0-9]{13,20})>?")
 
 
-def _cast_emoji(obj: EmojiType, *, _custom_emoji: Pattern[str] = _custom_emoji):
+# the number of emojis kept by _cast_emoji, buttons keep theirs once evicted
+_EMOJI_CACHE_SIZE = 512
+
+
+class _InternedEmoji(nextcord.PartialEmoji):
+    # A PartialEmoji returned by _cast_emoji for every button using the same
+    # emoji, which is why it cannot be modified. Its string and hash are
+    # computed once instead of on every lookup.
+
+    __slots__ = ("_str", "_hash")
+
+    def __init__(self, *, name: str, animated: bool = False, id: Optional[int] = None):
+        for attr, value in (("animated", animated), ("name", name), ("id", id), ("_state", None)):
+            object.__setattr__(self, attr, value)
+        object.__setattr__(self, "_str", nextcord.PartialEmoji.__str__(self))
+        object.__setattr__(self, "_hash", nextcord.PartialEmoji.__hash__(self))
+
+    def __setattr__(self, name: str, value: Any) -> NoReturn:
+        raise AttributeError("Cannot modify an emoji shared by menu buttons.")
+
+    def __delattr__(self, name: str) -> NoReturn:
+        raise AttributeError("Cannot modify an emoji shared by menu buttons.")
+
+    def __str__(self) -> str:
+        return self._str
+
+    def __hash__(self) -> int:
+        return self._hash
+
+    def __repr__(self) -> str:
+        return "<PartialEmoji animated={0.animated!r} name={0.name!r} id={0.id!r}>".format(self)
+
+    def __copy__(self) -> "_InternedEmoji":
+        return self
+
+    def __deepcopy__(self, memo: Any) -> "_InternedEmoji":
+        return self
+
+    def __reduce__(self):
+        return _cast_emoji, (self._str,)
+
+
+_emoji_cache: OrderedDictT[str, _InternedEmoji] = OrderedDict()
+
+
+def _cast_emoji(
+    obj: EmojiType, *, _custom_emoji: Pattern[str] = _custom_emoji
+) -> nextcord.PartialEmoji:
     if isinstance(obj, nextcord.PartialEmoji):
         return obj
 
     obj = str(obj)
+    emoji = _emoji_cache.get(obj)
+    if emoji is not None:
+        _emoji_cache.move_to_end(obj)
+        return emoji
+
     match = _custom_emoji.match(obj)
     if match is not None:
         groups = match.groupdict()
         animated = bool(groups["animated"])
         emoji_id = int(groups["id"])
         name = groups["name"]
-        return nextcord.PartialEmoji(name=name, animated=animated, id=emoji_id)
-    return nextcord.PartialEmoji(name=obj, id=None, animated=False)
+        emoji = _InternedEmoji(name=name, animated=animated, id=emoji_id)
+    else:
+        emoji = _InternedEmoji(name=obj, id=None, animated=False)
+
+    _emoji_cache[obj] = emoji
+    if len(_emoji_cache) > _EMOJI_CACHE_SIZE:
+        _emoji_cache.popitem(last=False)
+    return emoji
+
+
+def _emoji_key(emoji: nextcord.PartialEmoji) -> Union[int, str]:
+    # what PartialEmoji compares: the ID of custom emojis, the name of unicode ones
+    return emoji.name if emoji.id is None else emoji.id
@@ -0,0 +1,88 @@
+"""Stress tests the concurrent page requests of AsyncIteratorPageSource.
+
+Hundreds of overlapping get_page calls, some of them cancelled, are made while
+the iterator is also exhausted in the background. The iterator fails if it is
+advanced by two pulls at once, every page must hold the right entries, and
+``__anext__`` must be called exactly once per entry plus the final one.
+
+Run it from the root of the repository with ``task singleflight`` or
+``python -m scripts.async_iterator_single_flight``, which import the
+extension from the repository.
+"""
+
+import asyncio
+import random
+
+from nextcord.ext import menus
+
+ENTRIES = 1000
+PER_PAGE = 7
+REQUESTS = 500
+CANCEL_RATE = 0.1
+
+
+class SlowIterator:
+    def __init__(self, size: int):
+        self.size = size
+        self.position = 0
+        self.calls = 0
+        self.busy = False
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> int:
+        if self.busy:
+            raise AssertionError("The iterator was advanced by two pulls at once.")
+        self.busy = True
+        self.calls += 1
+        try:
+            await asyncio.sleep(random.random() / 1000)
+        finally:
+            self.busy = False
+        if self.position >= self.size:
+            raise StopAsyncIteration
+        self.position += 1
+        return self.position - 1
+
+
+class Source(menus.AsyncIteratorPageSource):
+    async def format_page(self, menu, page):
+        return str(page)
+
+
+async def main():
+    random.seed(0)
+    iterator = SlowIterator(ENTRIES)
+    source = Source(iterator, per_page=PER_PAGE, exhaust_in_background=True)
+    await source.prepare()
+
+    max_pages = -(-ENTRIES // PER_PAGE)
+    pages = [random.randrange(max_pages) for _ in range(REQUESTS)]
+
+    async def request(page_number: int):
+        if random.random() < CANCEL_RATE:
+            task = asyncio.ensure_future(source.get_page(page_number))
+            await asyncio.sleep(0)
+            task.cancel()
+            return None
+        return await source.get_page(page_number)
+
+    results = await asyncio.gather(*map(request, pages), return_exceptions=True)
+    for page_number, result in zip(pages, results):
+        if isinstance(result, BaseException):
+            raise result
+        expected = list(range(page_number * PER_PAGE, min((page_number + 1) * PER_PAGE, ENTRIES)))
+        if result is not None and result != expected:
+            raise AssertionError(f"Page {page_number} is {result!r}, expected {expected!r}.")
+
+    await source.wait_for_max_pages()
+    if source.get_max_pages() != max_pages:
+        raise AssertionError(f"Expected {max_pages} pages, not {source.get_max_pages()}.")
+    if iterator.calls != ENTRIES + 1:
+        raise AssertionError(f"Expected {ENTRIES + 1} pulls, not {iterator.calls}.")
+    print(f"{REQUESTS} concurrent requests, {iterator.calls} pulls, {max_pages} pages: ok")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,107 @@
+"""Measures how long importing nextcord.ext.menus takes and checks it stays cheap.
+
+``import nextcord`` and then ``import nextcord.ext.menus`` are timed with
+``python -X importtime`` in fresh interpreters. The median time of each is
+printed, the first as a baseline, along with the slowest modules imported
+by the extension. The script fails if the bare import of the extension loads
+a heavy module that only some of its submodules need, or if it takes longer
+than ``--budget`` milliseconds.
+
+Run it from the root of the repository with ``task importtime`` or
+``python -m scripts.import_time``, which import the extension from the
+repository.
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# modules only needed by some submodules, which are imported lazily
+HEAVY_MODULES = (
+    "sqlite3",
+    "concurrent.futures.process",
+    "mmap",
+    "nextcord.ext.commands",
+)
+
+IMPORT = "import nextcord; import nextcord.ext.menus"
+
+CHECK = """
+import sys
+import nextcord
+before = set(sys.modules)
+import nextcord.ext.menus
+print(" ".join(sorted(set(sys.modules) - before)))
+"""
+
+
+def run(code: str, *options: str) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, *options, "-c", code],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+def measure() -> Tuple[float, float, Dict[str, float]]:
+    # returns the cumulative times of nextcord and of the extension after it,
+    # and the self time of every module of the extension, in milliseconds
+    lines = run(IMPORT, "-X", "importtime").stderr.splitlines()
+    baseline = extension = 0.0
+    modules: Dict[str, float] = {}
+    after_nextcord = False
+    for line in lines:
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        self_time, cumulative, name = line[len("import time:") :].split("|")
+        # nested imports are indented, top-level ones are not
+        top_level = not name[1:].startswith(" ")
+        name = name.strip()
+        if top_level and name == "nextcord" and not after_nextcord:
+            baseline = int(cumulative) / 1000
+            after_nextcord = True
+        elif after_nextcord:
+            modules[name] = int(self_time) / 1000
+            if top_level:
+                extension += int(cumulative) / 1000
+    return baseline, extension, modules
+
+
+def main(argv: List[str]) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5, help="number of measurements")
+    parser.add_argument(
+        "--budget", type=float, help="maximum median import time of the extension, in ms"
+    )
+    args = parser.parse_args(argv)
+
+    results = [measure() for _ in range(args.runs)]
+    baseline = statistics.median(result[0] for result in results)
+    extension = statistics.median(result[1] for result in results)
+    print(f"import nextcord:            {baseline:8.2f}ms (baseline)")
+    print(f"import nextcord.ext.menus:  {extension:8.2f}ms")
+    slowest = sorted(results[-1][2].items(), key=lambda item: item[1], reverse=True)[:5]
+    for name, self_time in slowest:
+        print(f"    {name:<40} {self_time:8.2f}ms")
+
+    failed = False
+    loaded = set(run(CHECK).stdout.split())
+    for module in HEAVY_MODULES:
+        if module in loaded:
+            print(f"error: importing nextcord.ext.menus loads {module}")
+            failed = True
+    if args.budget is not None and extension > args.budget:
+        print(f"error: importing nextcord.ext.menus takes more than {args.budget}ms")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,73 @@
+"""Measures how long fast reaction buttons wait behind a slow one.
+
+A slow "refresh" button is clicked repeatedly while a fast button is clicked
+in between, once with every button sharing the default lock and once with
+the buttons in separate lock groups, and the latency of the fast clicks is
+printed for both.
+
+Run it from the root of the repository with ``task locklatency`` or
+``python -m scripts.lock_groups_latency``, which import the
+extension from the repository.
+"""
+
+import asyncio
+import statistics
+import time
+from typing import List, Tuple
+
+from nextcord.ext import menus
+
+REFRESHES = 10
+FAST_CLICKS_PER_REFRESH = 5
+REFRESH_DURATION = 0.2
+CLICK_INTERVAL = 0.01
+
+
+class Payload:
+    def __init__(self, emoji):
+        self.emoji = emoji
+
+
+def make_menu(grouped: bool) -> menus.Menu:
+    class LatencyMenu(menus.Menu):
+        @menus.button(
+            "\N{ANTICLOCKWISE DOWNWARDS AND UPWARDS OPEN CIRCLE ARROWS}",
+            lock="data" if grouped else True,
+        )
+        async def refresh(self, payload):
+            await asyncio.sleep(REFRESH_DURATION)
+
+        @menus.button("\N{WHITE MEDIUM STAR}", lock="ui" if grouped else True)
+        async def star(self, payload):
+            await asyncio.sleep(0.001)
+
+    return LatencyMenu()
+
+
+async def measure(grouped: bool) -> Tuple[float, float]:
+    menu = make_menu(grouped)
+    refresh, star = list(menu.buttons)
+    latencies: List[float] = []
+
+    async def click(emoji):
+        start = time.perf_counter()
+        await menu.update(Payload(emoji))
+        latencies.append(time.perf_counter() - start)
+
+    tasks = []
+    for _ in range(REFRESHES):
+        tasks.append(asyncio.ensure_future(menu.update(Payload(refresh))))
+        for _ in range(FAST_CLICKS_PER_REFRESH):
+            tasks.append(asyncio.ensure_future(click(star)))
+            await asyncio.sleep(CLICK_INTERVAL)
+    await asyncio.gather(*tasks)
+    return statistics.median(latencies) * 1000, max(latencies) * 1000
+
+
+async def main():
+    print("single lock: median {0:.1f}ms, max {1:.1f}ms".format(*await measure(False)))
+    print("lock groups: median {0:.1f}ms, max {1:.1f}ms".format(*await measure(True)))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())